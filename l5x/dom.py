@@ -70,11 +70,14 @@ def get_localized_cdata(parent, language):
         element = parent
 
     # Multi-language projects keep text for each language in child
-    # elements identified by the Lang attribute.
+    # elements identified by the Lang attribute. The children are compared
+    # directly as find() with an attribute predicate is evaluated by the
+    # Python ElementPath module, which is considerably slower.
     else:
-        path = "*[@Lang='{0}']".format(language)
-        element = parent.find(path)
-        if element is None:
+        for element in parent:
+            if element.attrib.get('Lang') == language:
+                break
+        else:
             return None
 
     return CDATAElement(element)
@@ -253,6 +256,26 @@ class AttributeDescriptor(object):
         return value
 
 
+class cached_property(object):
+    """Decorator for a method computing a value once per instance.
+
+    Equivalent to functools.cached_property, which is not available in
+    all supported Python versions. The computed value is stored in the
+    instance's dictionary, which takes precedence over this non-data
+    descriptor on subsequent access.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.func(instance)
+        instance.__dict__[self.func.__name__] = value
+        return value
+
+
 class ElementDictNames(object):
     """Descriptor class to get a list of an ElementDict's members."""
     def __get__(self, instance, owner=None):
@@ -272,6 +295,16 @@ class ElementDict(object):
     Instead of returning the actual XML element, a new object is
     instantiated and returned which is used to handle access to the child's
     data.
+
+    Child elements are indexed by key the first time any member is
+    accessed, and value objects are only created for members actually
+    accessed, after which they are retained for subsequent access.
+    The XML may be altered directly, so each indexed element is confirmed
+    to still be at its recorded position with the same key attribute
+    before it is used. The index is rebuilt if the number of child
+    elements changes, if an entry no longer matches, or if a key is not
+    found. A value object is only reused while its key refers to the same
+    element it was created for.
     """
     names = ElementDictNames()
 
@@ -284,14 +317,126 @@ class ElementDict(object):
         self.dfl_type = dfl_type
         self.key_type = key_type
         self.value_args = value_args
+        self.reset()
 
     def __getitem__(self, key):
         """Return a member class suitable for accessing a child element."""
-        xpath = "*[@{0}='{1}']".format(self.key_attr, key)
-        element = self.parent.find(xpath)
+        # Previously created value objects are returned directly if their
+        # index entry is still valid, without calling lookup().
+        if len(self.parent) == self.count:
+            try:
+                position, element, raw_key = self.elements[key]
+                cached_element, value = self.values[key]
+            except KeyError:
+                pass
+            else:
+                if ((cached_element is element)
+                        and (self.parent[position] is element)
+                        and (element.get(self.key_attr) is raw_key)):
+                    return value
+
+        element = self.get_element(key)
+
+        # Value objects are stored with the element they were created for,
+        # and only reused if the key still refers to that element.
+        try:
+            cached_element, value = self.values[key]
+        except KeyError:
+            pass
+        else:
+            if cached_element is element:
+                return value
+
+        value = self.create_value_object(element)
+        self.values[key] = (element, value)
+        return value
+
+    def get_element(self, key):
+        """Return the child element with a given key."""
+        if len(self.parent) != self.count:
+            self.build_index()
+
+        element = self.lookup(key)
+
+        # Children may have been replaced or renamed without changing
+        # their number, so the index is rebuilt once before concluding
+        # the key does not exist.
         if element is None:
-            raise KeyError("{0} not found".format(key))
-        return self.create_value_object(element)
+            self.build_index()
+            element = self.lookup(key)
+            if element is None:
+                raise KeyError("{0} not found".format(key))
+
+        return element
+
+    def get_elements(self, keys):
+        """Return a list of child elements for a series of keys."""
+        if len(self.parent) != self.count:
+            self.build_index()
+
+        # The index entries are validated inline, the same as lookup(),
+        # as this is used to access entire rows of array members.
+        parent = self.parent
+        key_attr = self.key_attr
+        index = self.elements
+        elements = []
+        for key in keys:
+            try:
+                position, element, raw_key = index[key]
+            except KeyError:
+                break
+            if ((parent[position] is not element)
+                    or (element.get(key_attr) is not raw_key)):
+                break
+            elements.append(element)
+        else:
+            return elements
+
+        # Fall back to individual lookups, which rebuild the index, if
+        # any key was missing or stale.
+        return [self.get_element(k) for k in keys]
+
+    def lookup(self, key):
+        """Returns the indexed element for a given key.
+
+        Returns None if the key is not indexed, or if the indexed element
+        is no longer the child at its recorded position or its key
+        attribute has been replaced.
+        """
+        try:
+            position, element, raw_key = self.elements[key]
+        except KeyError:
+            return None
+
+        if ((self.parent[position] is element)
+                and (element.get(self.key_attr) is raw_key)):
+            return element
+        return None
+
+    def reset(self):
+        """Discards the index and all value objects."""
+        self.count = None
+        self.elements = {}
+        self.values = {}
+
+    def build_index(self):
+        """Generates a dictionary of child elements keyed by key attribute.
+
+        Each entry records the element's position and key attribute
+        string, which are used to confirm the entry still matches the
+        XML. Value objects are retained only for keys still referring to
+        the element they were created for.
+        """
+        elements = {}
+        for position, e in enumerate(self.parent):
+            key = e.attrib.get(self.key_attr)
+            if key is not None:
+                elements[self.key_type(key)] = (position, e, key)
+        self.elements = elements
+        self.count = len(self.parent)
+
+        self.values = dict([(k, v) for k, v in self.values.items()
+                            if (k in elements) and (elements[k][1] is v[0])])
 
     def create_value_object(self, element):
         """Instantiates an object returned as the value."""
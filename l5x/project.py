@@ -10,13 +10,30 @@ __get__() method. In this way the application can process L5X projects
 without worrying about low-level XML handling.
 """
 
-from .dom import (CDATA_TAG, ElementDict, AttributeDescriptor)
+from .dom import (CDATA_TAG, ElementDict, AttributeDescriptor,
+                  cached_property)
 from .module import (Module, SafetyNetworkNumber)
 from .tag import Scope
 import io
+import mmap
 import re
 import xml.etree.ElementTree as ElementTree
 import xml.dom.minidom
+import xml.parsers.expat
+
+
+# Regular expression pattern to locate CDATA elements.
+CDATA_ELEMENT_PATTERN = re.compile(r"""
+    # Match elements with separate opening and closing tags.
+    <{0}\s*>  # Opening tag.
+    .*?       # Element content.
+    </{0}\s*> # Closing tag
+
+    |
+
+    # Also match empty, self-closing tags.
+    <{0}\s*/>
+""".format(CDATA_TAG), re.VERBOSE | re.DOTALL)
 
 
 class InvalidFile(Exception):
@@ -26,6 +43,10 @@ class InvalidFile(Exception):
 
 class Project(object):
     """Top-level container for an entire Logix project."""
+    # Size of the buffer used when writing output files, large enough to
+    # hold several CDATAWriter chunks per system call.
+    WRITE_BUFFER_SIZE = 1 << 20
+
     def __init__(self, filename):
         # Dummy document used only for generating replacement CDATA sections.
         implementation = xml.dom.minidom.getDOMImplementation()
@@ -38,65 +59,63 @@ class Project(object):
             raise InvalidFile('Not an L5X file.')
 
         try:
-            lang = self.doc.attrib['CurrentLanguage']
+            self.lang = self.doc.attrib['CurrentLanguage']
         except KeyError:
-            lang = None
+            self.lang = None
 
         ctl_element = self.doc.find('Controller')
-        self.controller = Controller(ctl_element, lang)
-
-        progs = ctl_element.find('Programs')
-        self.programs = ElementDict(progs, 'Name', Scope, value_args=[lang])
-
-        mods = ctl_element.find('Modules')
-        self.modules = ElementDict(mods, 'Name', Module)
+        self.controller = Controller(ctl_element, self.lang)
+
+    # Programs and modules are not accessed until needed, as many
+    # applications only require one of them, if any.
+    @cached_property
+    def programs(self):
+        """Container of program scopes, keyed by program name."""
+        progs = self.controller.element.find('Programs')
+        return ElementDict(progs, 'Name', Scope, value_args=[self.lang])
+
+    @cached_property
+    def modules(self):
+        """Container of I/O modules, keyed by module name."""
+        mods = self.controller.element.find('Modules')
+        return ElementDict(mods, 'Name', Module)
 
     def parse(self, filename):
         """Parses the source project."""
+        parser = Parser()
+
         # Accept both filename strings for normal usage, and buffer objects
         # for unit tests.
         try:
-            f = io.open(filename, encoding='UTF-8')
-        except TypeError:
-            f = filename
+            f = io.open(filename, 'rb')
 
-        with f:
-            orig = f.read()
+        # The (unicode) buffer content needs to be converted to a series
+        # of bytes to match the content read from a file.
+        except TypeError:
+            with filename:
+                parser.feed(filename.read().encode('UTF-8'))
 
-        # Swap out CDATA sections before parsing.
-        cdata_replaced = self.convert_to_cdata_element(orig)
+        # Files are memory-mapped so the parser reads directly from the
+        # page cache instead of a copy of the entire file.
+        else:
+            with f:
+                try:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        # The (unicode) string needs to be converted back to a series
-        # of bytes before ElementTree parses it.
-        encoded = cdata_replaced.encode('UTF-8')
+                # Sources that cannot be mapped, such as empty files and
+                # pipes, are read in chunks instead; the parser reports
+                # empty content as a parsing error.
+                except (ValueError, mmap.error):
+                    for data in iter(lambda: f.read(parser.CHUNK_SIZE), b''):
+                        parser.feed(data)
 
-        try:
-            self.doc = ElementTree.fromstring(encoded)
-        except ElementTree.ParseError as e:
-            raise InvalidFile("XML parsing error: {0}".format(e))
+                else:
+                    try:
+                        parser.feed(mapped)
+                    finally:
+                        mapped.close()
 
-    def convert_to_cdata_element(self, doc):
-        """Replaces the delimiters surrounding CDATA sections.
-
-        This is used before parsing to convert CDATA sections into
-        normal elements.
-        """
-        pattern = r"""
-            <!\[CDATA\[   # Opening CDATA sequence.
-            (?P<text>.*?) # Element content.
-            \]\]>         # Closing CDATA sequence.
-        """
-        return re.sub(pattern, self.cdata_element, doc,
-                      flags=re.VERBOSE | re.DOTALL)
-
-    def cdata_element(self, match):
-        """
-        Generates a string representation of an XML element with a given
-        text content. Used when replacing CDATA sections with elements.
-        """
-        element = ElementTree.Element(CDATA_TAG)
-        element.text = match.group('text')
-        return ElementTree.tostring(element).decode()
+        self.doc = parser.close()
 
     def convert_to_cdata_section(self, doc):
         """Replaces CDATA elements with CDATA sections.
@@ -104,20 +123,7 @@ class Project(object):
         This is used before writing a project to reinstall the CDATA sections
         required by RSLogix.
         """
-        # Regular expression pattern to locate CDATA elements.
-        pattern = r"""
-            # Match elements with separate opening and closing tags.
-            <{0}\s*>  # Opening tag.
-            .*?       # Element content.
-            </{0}\s*> # Closing tag
-
-            |
-
-            # Also match empty, self-closing tags.
-            <{0}\s*/>
-        """.format(CDATA_TAG)
-        return re.sub(pattern, self.cdata_section, doc,
-                      flags=re.VERBOSE | re.DOTALL)
+        return CDATA_ELEMENT_PATTERN.sub(self.cdata_section, doc)
 
     def cdata_section(self, match):
         """
@@ -143,33 +149,152 @@ class Project(object):
 
     def write(self, filename):
         """Outputs the document to a new file."""
-        no_cdata = self.doc_to_string()
-        with_cdata = self.convert_to_cdata_section(no_cdata)
-
-        encoded = with_cdata.encode('UTF-8')
         try:
-            f = open(filename, 'wb')
+            f = open(filename, 'wb', self.WRITE_BUFFER_SIZE)
 
         # Accept buffer targets for unit testing.
         except TypeError:
-            filename.write(encoded)
+            self.write_stream(filename)
             filename.seek(0)
 
         else:
             with f:
-                f.write(encoded)
+                self.write_stream(f)
 
-    def doc_to_string(self):
-        """Serializes the document into a unicode string.
+    def write_stream(self, f):
+        """Serializes the document into a binary file object.
 
-        This is used instead of ElementTree's tostring() method because
-        an XML declaration is required, which can only be generated
-        with write().
+        The document is streamed through a CDATAWriter instead of being
+        serialized into a single string, which would then be copied
+        again when the CDATA sections are reinstalled.
         """
+        writer = CDATAWriter(self, f)
         tree = ElementTree.ElementTree(self.doc)
-        buf = io.BytesIO()
-        tree.write(buf, encoding='UTF-8', xml_declaration=True)
-        return buf.getvalue().decode('UTF-8')
+        tree.write(writer, encoding='UTF-8', xml_declaration=True)
+        writer.close()
+
+
+class Parser(object):
+    """Builds an ElementTree document from source L5X content.
+
+    Logix uses CDATA sections to enclose certain content, which are
+    converted into CDATA elements; see dom.CDATA_TAG. Expat reports the
+    boundaries of each CDATA section, allowing the enclosing CDATA
+    element to be created directly as the document is parsed instead
+    of rewriting the source content before parsing.
+    """
+    # Amount of source content given to expat with each call.
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self):
+        self.builder = ElementTree.TreeBuilder()
+        self.expat = xml.parsers.expat.ParserCreate()
+
+        # Deliver all contiguous text in a single call.
+        self.expat.buffer_text = True
+
+        self.expat.StartElementHandler = self.builder.start
+        self.expat.EndElementHandler = self.builder.end
+        self.expat.CharacterDataHandler = self.builder.data
+        self.expat.StartCdataSectionHandler = self.start_cdata
+        self.expat.EndCdataSectionHandler = self.end_cdata
+        self.expat.StartDoctypeDeclHandler = self.doctype
+
+    def feed(self, data):
+        """Parses a series of source bytes."""
+        for start in range(0, len(data), self.CHUNK_SIZE):
+            self.parse(data[start:start + self.CHUNK_SIZE], False)
+
+    def close(self):
+        """Finishes parsing and returns the root element."""
+        self.parse(b'', True)
+        return self.builder.close()
+
+    def parse(self, data, final):
+        """Passes source content to expat."""
+        try:
+            self.expat.Parse(data, final)
+        except xml.parsers.expat.ExpatError as e:
+            raise InvalidFile("XML parsing error: {0}".format(e))
+
+    def start_cdata(self):
+        """Opens a new CDATA element at the start of a CDATA section."""
+        self.builder.start(CDATA_TAG, {})
+
+    def end_cdata(self):
+        """Closes the CDATA element at the end of a CDATA section."""
+        self.builder.end(CDATA_TAG)
+
+    def doctype(self, *args):
+        """Handler for document type declarations.
+
+        L5X exports never contain a document type declaration. Refuse
+        any that do instead of processing the DTD, which could include
+        expensive or malicious entity definitions.
+        """
+        raise InvalidFile('Document type declarations are not permitted.')
+
+
+class CDATAWriter(object):
+    """File-like object used as the target when serializing a project.
+
+    Serialized content is accumulated into chunks, which have their
+    CDATA elements replaced with CDATA sections before being written
+    to the output file. Content following the last complete element in
+    each chunk is carried over to the next chunk so a CDATA element is
+    never split across a chunk boundary.
+    """
+    CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, project, f):
+        self.project = project
+        self.f = f
+        self.pending = []
+        self.pending_size = 0
+
+    def write(self, data):
+        """Accepts a serialized UTF-8 byte string from ElementTree."""
+        self.pending.append(data)
+        self.pending_size += len(data)
+        if self.pending_size >= self.CHUNK_SIZE:
+            self.flush_chunk(False)
+        return len(data)
+
+    def close(self):
+        """Writes any remaining content to the output file."""
+        self.flush_chunk(True)
+
+    def flush_chunk(self, final):
+        """Converts and writes accumulated content to the output file."""
+        data = b''.join(self.pending)
+
+        # Hold back everything from the last opening angle bracket as it
+        # may be the start of an incomplete element. This also ensures
+        # the split is never made in the middle of a multibyte UTF-8
+        # character.
+        if final:
+            split = len(data)
+        else:
+            split = data.rfind(b'<')
+            if split == -1:
+                split = len(data)
+
+        text = data[:split].decode('UTF-8')
+        carry = data[split:]
+
+        # A CDATA element may still be open at the end of the chunk if
+        # the held back bracket began its closing tag.
+        if not final:
+            start = text.rfind('<' + CDATA_TAG)
+            if (start != -1) and not CDATA_ELEMENT_PATTERN.match(text, start):
+                carry = text[start:].encode('UTF-8') + carry
+                text = text[:start]
+
+        converted = self.project.convert_to_cdata_section(text)
+        self.f.write(converted.encode('UTF-8'))
+
+        self.pending = [carry]
+        self.pending_size = len(carry)
 
 
 class Controller(Scope):
@@ -3,11 +3,17 @@ Objects implementing tag access.
 """
 
 from l5x import dom
+import array as typed_array
 import copy
-import ctypes
 import itertools
+import math
 import xml.etree.ElementTree as ElementTree
 
+try:
+    from sys import intern
+except ImportError: # Python 2.7 provides intern() as a built-in.
+    pass
+
 
 class Scope(object):
     """Container to hold a group of tags within a specific scope."""
@@ -18,64 +24,49 @@ class Scope(object):
                                     value_args=[lang])
 
 
-class TagDataDescriptor(object):
-    """Descriptor class to dispatch attribute access to a data object.
+class ConsumeDescriptor(object):
+    """Descriptor class for accessing consumed tag properties.
 
-    Used by Tag objects to pass access to a specific attribute on to the
-    Data element which handles the implementation.
+    The tag type is checked and the ConsumeInfo element located inline,
+    without calling helper methods, as both are needed for every access.
+    Neither is cached because the tag's XML may be altered directly.
     """
     def __init__(self, attr):
         self.attr = attr
 
-    def __get__(self, tag, owner=None):
-        return getattr(tag.data, self.attr)
-
-    def __set__(self, tag, value):
-        setattr(tag.data, self.attr, value)
-
-
-class ConsumeDescriptor(object):
-    """Descriptor class for accessing consumed tag properties."""
-    def __init__(self, attr):
-        self.attr = attr
-
     def __get__(self, tag, owner=None):
         """Returns the current consumed tag property."""
-        self.check_consumed(tag)
-        info = self.get_info(tag)
-        return info.attrib[self.attr]
-        
+        element = tag.element
+        if element.attrib['TagType'] != 'Consumed':
+            self.raise_not_consumed(tag)
+        return element.find('ConsumeInfo').attrib[self.attr]
+
     def __set__(self, tag, value):
         """Sets a new consumed tag property."""
-        self.check_consumed(tag)
-        
+        element = tag.element
+        if element.attrib['TagType'] != 'Consumed':
+            self.raise_not_consumed(tag)
+
         # Producer names must be non-empty strings.
         if not isinstance(value, str):
             raise TypeError('Producer must be a string')
-        if len(value) == 0:
+        if not value:
             raise ValueError('Producer string cannot be empty')
 
-        info = self.get_info(tag)
-        info.attrib[self.attr] = value
-
-    def check_consumed(self, tag):
-        """Verifies this is a consumed tag."""
-        if tag.element.attrib['TagType'] != 'Consumed':
-            raise TypeError("Tag {0} is not a consumed tag".format(
-                tag.element.attrib['Name']))
+        element.find('ConsumeInfo').attrib[self.attr] = value
 
-    def get_info(self, tag):
-        """Retrieves the ConsumeInfo XML element."""
-        return tag.element.find('ConsumeInfo')
+    def raise_not_consumed(self, tag):
+        """Raises the exception for access to a tag that is not consumed."""
+        raise TypeError("Tag {0} is not a consumed tag".format(
+            tag.element.attrib['Name']))
 
 
 class Tag(object):
     """Base class for a single tag."""
+    __slots__ = ('element', 'lang', 'data', 'decorated_data', 'raw_data',
+                 'comment_index')
+
     description = dom.ElementDescription(['ConsumeInfo'])
-    data_type = dom.AttributeDescriptor('DataType', True)
-    value = TagDataDescriptor('value')
-    shape = TagDataDescriptor('shape')
-    names = TagDataDescriptor('names')
     producer = ConsumeDescriptor('Producer')
     remote_tag = ConsumeDescriptor('RemoteTag')
 
@@ -93,11 +84,68 @@ class Tag(object):
         # Normal base tag; return an instance of this class.
         return object.__new__(cls)
 
+    # The data type is read frequently and never altered, so a built-in
+    # read-only property is used instead of an AttributeDescriptor,
+    # avoiding a Python-level __get__ call and string conversion.
+    @property
+    def data_type(self):
+        """Name of the tag's data type."""
+        return self.element.attrib['DataType']
+
+    # Access to the tag's value and other data attributes is passed on to
+    # the data object implementing them with built-in properties, which
+    # avoid the Python-level __get__ and getattr() calls of a generic
+    # forwarding descriptor.
+    @property
+    def value(self):
+        """The tag's complete value."""
+        return self.data.value
+
+    @value.setter
+    def value(self, value):
+        self.data.value = value
+
+    @property
+    def shape(self):
+        """Dimensions of array tags."""
+        return self.data.shape
+
+    @shape.setter
+    def shape(self, value):
+        self.data.shape = value
+
+    @property
+    def names(self):
+        """Member names of structured tags."""
+        return self.data.names
+
+    @names.setter
+    def names(self, value):
+        self.data.names = value
+
     def __init__(self, element, lang):
         self.element = element
         self.lang = lang
+        self.find_data_elements()
         data_class = base_data_types.get(self.data_type, Structure)
-        self.data = data_class(self.get_data_element(), self)
+        self.data = create_data(data_class, self.get_data_element(), self)
+
+    def find_data_elements(self):
+        """Locates the tag's decorated and undecorated Data elements.
+
+        The elements are located once with a single pass through the
+        tag's children instead of searching every time they are needed.
+        """
+        self.decorated_data = None
+        self.raw_data = []
+        # findall() is used instead of iterfind() because the C ElementTree
+        # implementation handles plain tag names itself, without going
+        # through the Python ElementPath module.
+        for e in self.element.findall('Data'):
+            if e.attrib.get('Format') == 'Decorated':
+                self.decorated_data = e
+            else:
+                self.raw_data.append(e)
 
     def get_data_element(self):
         """Returns the decorated data XML element.
@@ -105,15 +153,13 @@ class Tag(object):
         This is always the sole element contained with the decorated Data
         element.
         """
-        data = self.element.find("Data[@Format='Decorated']/*")
-
-        if data is None:
+        if (self.decorated_data is None) or (len(self.decorated_data) == 0):
             name = self.element.attrib['Name']
             raise RuntimeError("Decoded data content not found for {0} tag. "
                                "Ensure Encode Source Protected Content option "
                                "is disabled when saving L5X.".format(name))
 
-        return data
+        return self.decorated_data[0]
 
     def __getitem__(self, key):
         """
@@ -126,23 +172,33 @@ class Tag(object):
         """Dispatches len queries to the base data type object."""
         return len(self.data)
 
+    def set_bits(self, set_mask=0, clear_mask=0):
+        """Dispatches multiple bit updates to integer data objects."""
+        if not isinstance(self.data, Integer):
+            raise TypeError('Bit masks may only be applied to integer tags')
+        self.data.set_bits(set_mask, clear_mask)
+
+    def as_array(self):
+        """Dispatches typed array conversion to array data objects."""
+        if not isinstance(self.data, Array):
+            raise TypeError('Only the last dimension of base data type '
+                            'arrays may be converted to typed arrays')
+        return self.data.as_array()
+
     def clear_raw_data(self):
         """Removes any data elements other than decorated.
         
         Called anytime a data value is set to avoid conflicts with
         modified decorated data elements.
         """
-        undecorated_data = []
-        for e in self.element.iterfind('Data'):
-            try:
-                format = e.attrib['Format']
-            except KeyError:
-                undecorated_data.append(e)
-            else:
-                if format != 'Decorated':
-                    undecorated_data.append(e)
+        # Return immediately for the common case of every value set after
+        # the first, once the raw data elements have been removed.
+        if not self.raw_data:
+            return
 
-        [self.element.remove(e) for e in undecorated_data]
+        for e in self.raw_data:
+            self.element.remove(e)
+        self.raw_data = []
 
 
 class AliasFor(object):
@@ -172,6 +228,8 @@ class AliasFor(object):
 
 class AliasTag(object):
     """Handler for accessing alias tags."""
+    __slots__ = ('element', 'lang')
+
     description = dom.ElementDescription()
     alias_for = AliasFor()
 
@@ -189,36 +247,65 @@ class Comment(object):
     """
     def __get__(self, instance, owner=None):
         """Returns the data's description."""
-        # Acquire the overall Comments parent element.
         comments = instance.tag.element.find('Comments')
-        if comments is None:
-            return None
 
-        # Locate the Comment child with the matching operand.
-        try:
-            element = self.get_comment_element(instance, comments)
-        except KeyError:
-            return None
+        # Single-language projects store the text directly in the Comment
+        # element, which is read without creating a CDATA access object.
+        if (instance.tag.lang is None) and (comments is not None):
+            try:
+                element = self.get_comment_element(instance, comments)
+            except KeyError:
+                return None
+            text = element.find(dom.CDATA_TAG).text
+            if text is None:
+                return ''
+            return text
 
-        cdata = dom.get_localized_cdata(element, instance.tag.lang)
+        cdata = self.get_cdata(instance, comments)
         if cdata is None:
             return None
         return str(cdata)
 
     def __set__(self, instance, value):
         """Updates, creates, or removes a comment."""
-        if value is not None:
-            if self.__get__(instance) is None:
-                self.create(instance, value)
-            else:
-                self.modify(instance, value)
+        # The overall Comments parent element is located once and passed
+        # to the methods implementing each operation.
+        comments = instance.tag.element.find('Comments')
+
+        if value is None:
+            self.delete(instance, comments)
+            return
+
+        # Existing text is modified through the same CDATA object used
+        # to determine if a comment exists instead of searching for the
+        # Comment element again.
+        cdata = self.get_cdata(instance, comments)
+        if cdata is None:
+            self.create(instance, value, comments)
         else:
-            self.delete(instance)
+            cdata.set(value)
+
+    def get_cdata(self, instance, comments):
+        """Locates the CDATA content of the instance's comment.
+
+        The comments parameter is the tag's Comments element, or None if
+        the tag has no Comments element. Returns None if no comment exists
+        in the current language.
+        """
+        if comments is None:
+            return None
 
-    def create(self, instance, text):
+        # Locate the Comment child with the matching operand.
+        try:
+            element = self.get_comment_element(instance, comments)
+        except KeyError:
+            return None
+
+        return dom.get_localized_cdata(element, instance.tag.lang)
+
+    def create(self, instance, text, comments):
         """Creates a new comment."""
-        # Get the parent Comments element, creating one if necessary.
-        comments = instance.tag.element.find('Comments')
+        # Create the parent Comments element if necessary.
         if comments is None:
             comments = self.create_comments(instance)
 
@@ -238,21 +325,17 @@ class Comment(object):
 
         # Create a new Comment element with the target operand.
         except KeyError:
+            count = len(comments)
             comment = ElementTree.SubElement(comments, 'Comment',
                                              {'Operand':instance.operand})
+            index = self.get_current_index(instance, comments, count)
+            if index is not None:
+                index[instance.operand] = comment
 
         dom.create_localized_cdata(comment, instance.tag.lang, text)
 
-    def modify(self, instance, text):
-        """Alters an existing comment."""
-        comments_parent = instance.tag.element.find('Comments')
-        comment = self.get_comment_element(instance, comments_parent)
-        dom.modify_localized_cdata(comment, instance.tag.lang, text)
-
-    def delete(self, instance):
+    def delete(self, instance, comments):
         """Removes a comment."""
-        # Acquire the overall Comments parent element.
-        comments = instance.tag.element.find('Comments')
         if comments is None:
             return
 
@@ -263,7 +346,12 @@ class Comment(object):
             return
 
         # Remove the Comment or LocalizedComment containing the actual text.
+        count = len(comments)
         dom.remove_localized_cdata(comments, comment, instance.tag.lang)
+        if len(comments) < count:
+            index = self.get_current_index(instance, comments, count)
+            if index is not None:
+                del index[instance.operand]
 
         # Remove the entire Comments parent element if no other comments for any
         # operands remain.
@@ -279,52 +367,69 @@ class Comment(object):
         """
         comments = ElementTree.Element('Comments')
 
-        # Locate the index of the Data child element.
-        child_tags = [e.tag for e in instance.tag.element.iterfind('*')]
-        data_index = child_tags.index('Data')
+        # Locate the index of the first Data child element, stopping at
+        # the first match instead of collecting the names of every child.
+        for data_index, e in enumerate(instance.tag.element):
+            if e.tag == 'Data':
+                break
+        else:
+            raise ValueError('Data element not found')
 
         instance.tag.element.insert(data_index, comments)
         return comments
 
     def get_comment_element(self, instance, comments):
         """Acquires the Comment element of the instance's operand."""
-        path = "Comment[@Operand='{0}']".format(instance.operand)
-        element = comments.find(path)
-        if element is None:
-            raise KeyError()
-        return element
+        index = self.get_operand_index(instance, comments)
+        return index[instance.operand]
 
+    def get_operand_index(self, instance, comments):
+        """Returns a dictionary of Comment elements keyed by operand.
 
-class Data(object):
-    """Base class for objects providing access to tag values and comments."""
-    description = Comment()
-
-    def __new__(cls, *args, **kwds):
+        The dictionary is cached in the tag object to avoid searching
+        every Comment element when accessing each operand. It is rebuilt
+        if the Comments element has been replaced or the number of
+        Comment elements has been changed by other means.
         """
-        Intercepts creation of a new data object if the XML element
-        indicates it is an array, in which case an array access object
-        is created instead for the given data type.
+        try:
+            element, count, index = instance.tag.comment_index
+        except AttributeError:
+            element = None
+
+        if (element is not comments) or (count != len(comments)):
+            index = dict([(intern(c.attrib['Operand']), c)
+                          for c in comments.iterfind('Comment')])
+            instance.tag.comment_index = (comments, len(comments), index)
+
+        return index
+
+    def get_current_index(self, instance, comments, count):
+        """Acquires the cached operand index to update after a change.
+
+        Returns None if no index exists or it was not up to date prior
+        to the change, which had a given number of Comment elements;
+        the index will then be rebuilt upon the next access. Otherwise
+        the cached index is updated to the current number of Comment
+        elements, and is returned so the caller can add or remove the
+        affected operand.
         """
-        if args[0].tag.startswith('Array'):
+        try:
+            element, old_count, index = instance.tag.comment_index
+        except AttributeError:
+            return None
 
-            # Two array accessor types are possible depending on if the
-            # the array is a structure member.
-            if args[0].tag == ('ArrayMember'):
-                array_type = ArrayMember
-            else:
-                array_type = Array
+        if (element is not comments) or (old_count != count):
+            return None
 
-            array = object.__new__(array_type)
-            array_args = [cls]
-            array_args.extend(args)
-            array.__init__(*array_args, **kwds)
-            return array
+        instance.tag.comment_index = (comments, len(comments), index)
+        return index
 
-        # Non-array tags return a instance of the original type; an explicit
-        # call to __init__ is not required as the returned instance
-        # is the original class.
-        else:
-            return object.__new__(cls)
+
+class Data(object):
+    """Base class for objects providing access to tag values and comments."""
+    __slots__ = ('element', 'tag', 'parent', 'operand')
+
+    description = Comment()
 
     def __init__(self, element, tag, parent=None):
         self.element = element
@@ -349,50 +454,181 @@ class Data(object):
             self.operand = ''
         else:
             # One of two possible XML attributes determine how this data is
-            # identified.
-            try:
-                # Array members use the Index attribute, which is appended to
-                # the operand string without an additional separator; the
-                # enclosing square brackets are included in the attribute
-                # value.
-                operand = self.element.attrib['Index']
+            # identified. A single dictionary lookup is used to test for
+            # the Index attribute instead of handling a KeyError, which
+            # would be raised for every structure member.
+            attrib = self.element.attrib
+            operand = attrib.get('Index')
+
+            # Array members use the Index attribute, which is appended to
+            # the operand string without an additional separator; the
+            # enclosing square brackets are included in the attribute
+            # value.
+            if operand is not None:
                 sep = ''
-            except KeyError:
-                # All other operands use the Name attribute, which is
-                # separated from other operands by a dot.
-                operand = self.element.attrib['Name']
+
+            # All other operands use the Name attribute, which is
+            # separated from other operands by a dot.
+            else:
+                operand = attrib['Name']
                 sep = '.'
-                
-            self.operand = sep.join((self.parent.operand, operand.upper()))
+
+            # Operands are interned as they are used as keys to locate
+            # Comment elements, and many objects may refer to the same
+            # operand.
+            self.operand = intern(sep.join((self.parent.operand,
+                                            operand.upper())))
 
 
-class IntegerValue(object):
-    """Descriptor class for accessing an integer's value."""
+class ScalarValue(object):
+    """Base descriptor class for values stored in a single XML attribute.
+
+    Subclasses implement conversions between the attribute string and
+    Python values, which are also used directly by ArrayValue when
+    accessing values of an entire array of a base data type. Accessing
+    the descriptor through the data class returns the descriptor itself
+    to permit such access.
+
+    The converted value is cached in the data object along with the
+    attribute string it was converted from. Repeated reads only need to
+    confirm the attribute still refers to the same string object, which
+    also detects values altered by any other means.
+    """
     def __get__(self, instance, owner=None):
-        return int(instance.element.attrib['Value'])
+        if instance is None:
+            return self
+
+        raw = instance.element.attrib['Value']
+        try:
+            cached_raw, value = instance.cached_value
+        except AttributeError:
+            pass
+        else:
+            if cached_raw is raw:
+                return value
+
+        value = self.from_xml(raw)
+        instance.cached_value = (raw, value)
+        return value
 
     def __set__(self, instance, value):
         """Sets a new value."""
-        if (not isinstance(value, int)) or isinstance(value, bool):
-            raise TypeError('Value must be an integer')
-        if (value < instance.value_min) or (value > instance.value_max):
-            raise ValueError('Value out of range')
-        instance.element.attrib['Value'] = str(value)
+        raw = self.to_xml(instance, value)
+        instance.element.attrib['Value'] = raw
+
+        # Cache the new value so it will not be converted from the string
+        # just written when next read. This only applies to values of
+        # the exact type from_xml() produces; values of other types, such
+        # as subclasses, are converted upon reading.
+        if type(value) is self.from_xml:
+            instance.cached_value = (raw, value)
+
         instance.tag.clear_raw_data()
 
+    def to_xml_list(self, data, values):
+        """Validates and converts a list of new values.
+
+        Subclasses may override this to validate the entire list at once
+        for common cases. This default implementation converts each value
+        individually.
+        """
+        return [self.to_xml(data, v) for v in values]
+
+
+class IntegerValue(ScalarValue):
+    """Descriptor class for accessing an integer's value.
+
+    Each data type creates its own instance with that type's range, so
+    validating a new value only refers to the descriptor itself.
+    """
+    # Converts the XML attribute string into an integer. The built-in
+    # type is used directly so ArrayValue can map it over a series of
+    # attribute strings without calling a Python-level function.
+    from_xml = staticmethod(int)
+
+    def __init__(self, value_min, value_max):
+        self.value_min = value_min
+        self.value_max = value_max
+
+    def to_xml(self, data, value):
+        """Validates a new value and converts it to an attribute string."""
+        # Plain integers, by far the most common values, are accepted with
+        # a single type comparison; only other types require the complete
+        # check, which permits int subclasses other than bool.
+        if type(value) is not int:
+            if (not isinstance(value, int)) or isinstance(value, bool):
+                raise TypeError('Value must be an integer')
+        if not (self.value_min <= value <= self.value_max):
+            raise ValueError('Value out of range')
+        return str(value)
+
+    def to_xml_list(self, data, values):
+        """Validates and converts a list of new values.
+
+        Lists consisting only of plain integers are validated with
+        single min() and max() calls and converted with a C-level map;
+        anything else falls back to converting each value individually,
+        which also generates the appropriate exception for invalid values.
+        """
+        if values and (set(map(type, values)) == set([int])) \
+           and (min(values) >= self.value_min) \
+           and (max(values) <= self.value_max):
+            return list(map(str, values))
+
+        return ScalarValue.to_xml_list(self, data, values)
+
 
 class Integer(Data):
     """Base class for integer data types.
 
     In addition to the usual value and description access, integer indices
     are used for bit-level references.
+
+    Subclasses define the integer's width, a value descriptor with the
+    appropriate range, and the array module type code used when arrays
+    of the type are converted to typed arrays.
     """
-    value = IntegerValue()
+    __slots__ = ('cached_value', 'bit_objects')
 
     def __getitem__(self, bit):
-        """Gets an object to access a single bit."""
+        """Gets an object to access a single bit.
+
+        Bit objects are retained after being created so repeated access
+        to the same bit does not construct a new object and operand.
+        """
+        try:
+            return self.bit_objects[bit]
+        except AttributeError:
+            self.bit_objects = {}
+        except (KeyError, TypeError):
+            pass
+
         self.validate_bit_number(bit)
-        return Bit(self.element, self.tag, self, bit)
+        obj = Bit(self.element, self.tag, self, bit)
+        self.bit_objects[bit] = obj
+        return obj
+
+    def set_bits(self, set_mask=0, clear_mask=0):
+        """Sets and clears multiple bits with a single value update.
+
+        Bits that are one in set_mask are set, and bits that are one in
+        clear_mask are cleared; set_mask takes precedence for bits present
+        in both. Masks are unsigned and limited to the integer's width.
+        """
+        for mask in (set_mask, clear_mask):
+            if (not isinstance(mask, int)) or isinstance(mask, bool):
+                raise TypeError('Bit masks must be integers')
+            if (mask < 0) or (mask >> self.bits):
+                raise ValueError('Bit mask out of range')
+
+        value = (self.value & ~clear_mask) | set_mask
+
+        # Convert the unsigned result back to a signed value.
+        value &= (1 << self.bits) - 1
+        if value & (1 << (self.bits - 1)):
+            value -= 1 << self.bits
+
+        self.value = value
 
     def validate_bit_number(self, bit):
         """Verifies a given bit index is within range."""
@@ -408,42 +644,45 @@ class Integer(Data):
 
 class SINT(Integer):
     """Base class for 8-bit signed integers."""
+    __slots__ = ()
+
     bits = 8
-    ctype = ctypes.c_int8
-    value_min = -128
-    value_max = 127
+    value = IntegerValue(-128, 127)
+    typecode = 'b'
 
 
 class INT(Integer):
     """Base class for 16-bit signed integers."""
+    __slots__ = ()
+
     bits = 16
-    ctype = ctypes.c_int16
-    value_min = -32768
-    value_max = 32767
+    value = IntegerValue(-32768, 32767)
+    typecode = 'h'
 
 
 class DINT(Integer):
     """Base class for 32-bit signed integers."""
+    __slots__ = ()
+
     bits = 32
-    ctype = ctypes.c_int32
-    value_min = -2147483648
-    value_max = 2147483647
+    value = IntegerValue(-2147483648, 2147483647)
+
+    # 'i' is used instead of 'l' as long integers are 64 bits on some
+    # platforms.
+    typecode = 'i'
 
 
 class BitValue(object):
     """Descriptor class for values of individual integer bits.
 
-    Bit access utilizes exact-width, signed ctype integers for
-    bit-level operations which are then translated back to the parent
-    integer's value. This ensures correct results when the sign bit
-    is accessed.
+    Python integers behave as if they had an infinite number of sign
+    bits, so bits are read directly from the parent integer's value.
+    New values are applied through the parent's set_bits() method, which
+    truncates the result to the parent integer's width and then applies
+    the sign bit, ensuring correct results when the sign bit is accessed.
     """
     def __get__(self, bit, owner=None):
-        cvalue = self.get_ctype(bit)
-        if cvalue.value & bit.mask.value:
-            return 1
-        else:
-            return 0
+        return (bit.parent.value >> bit.bit) & 1
 
     def __set__(self, bit, bit_value):
         if not isinstance(bit_value, int):
@@ -451,63 +690,78 @@ class BitValue(object):
         elif (bit_value < 0) or (bit_value > 1):
             raise ValueError('Bit values may only be 0 or 1')
 
-        cvalue = self.get_ctype(bit)
+        mask = 1 << bit.bit
         if bit_value:
-            cvalue.value |= bit.mask.value
+            bit.parent.set_bits(set_mask=mask)
         else:
-            cvalue.value &= ~bit.mask.value
-        bit.parent.value = int(cvalue.value)
-
-    def get_ctype(self, bit):
-        """Returns the parent integer's value as a ctype."""
-        return bit.parent.ctype(bit.parent.value)
+            bit.parent.set_bits(clear_mask=mask)
 
 
 class Bit(Data):
     """Provides access to individual bits within an integer."""
+    __slots__ = ('bit',)
+
     value = BitValue()
     description = Comment()
 
     def __init__(self, element, tag, parent, bit):
         self.bit = bit
         Data.__init__(self, element, tag, parent)
-        self.mask = parent.ctype(1 << bit)
 
     def build_operand(self):
         """Method override to create an operand based on the bit number."""
-        self.operand = '.'.join((self.parent.operand, str(self.bit)))
+        self.operand = intern('.'.join((self.parent.operand, str(self.bit))))
 
 
 class BOOL(Data):
     """Tag access for BOOL data types."""
-    value = IntegerValue()
-    value_min = 0
-    value_max = 1
+    __slots__ = ('cached_value',)
 
+    value = IntegerValue(0, 1)
+    typecode = 'b'
 
-class RealValue(object):
+
+class RealValue(ScalarValue):
     """Descriptor class for accessing REAL values."""
-    def __get__(self, instance, owner=None):
-        return float(instance.element.attrib['Value'])
+    # Converts the XML attribute string into a float; see IntegerValue.
+    from_xml = staticmethod(float)
 
-    def __set__(self, instance, value):
-        if not isinstance(value, float):
+    def to_xml(self, data, value):
+        """Validates a new value and converts it to an attribute string."""
+        # See IntegerValue.to_xml().
+        if (type(value) is not float) and (not isinstance(value, float)):
             raise TypeError('Value must be a float')
 
         # Check for NaN and infinite values.
-        try:
-            value.as_integer_ratio()
-        except (OverflowError, ValueError):
+        if math.isinf(value) or math.isnan(value):
             raise ValueError('NaN and infinite values are not supported')
-            
-        instance.element.attrib['Value'] = str(value)
-        instance.tag.clear_raw_data()
+
+        return str(value)
+
+    def to_xml_list(self, data, values):
+        """Validates and converts a list of new values.
+
+        Lists consisting only of finite floats are validated and converted
+        with C-level maps; otherwise each value is converted individually.
+        """
+        if values and (set(map(type, values)) == set([float])) \
+           and not any(map(math.isinf, values)) \
+           and not any(map(math.isnan, values)):
+            return list(map(str, values))
+
+        return ScalarValue.to_xml_list(self, data, values)
 
 
 class REAL(Data):
     """Tag access for REAL data types."""
+    __slots__ = ('cached_value',)
+
     value = RealValue()
 
+    # Values are stored as double precision when converted to typed
+    # arrays so they remain identical to the float values from the XML.
+    typecode = 'd'
+
 
 class StructureValue(object):
     """Descriptor class for accessing multiple structure values.
@@ -515,14 +769,35 @@ class StructureValue(object):
     Values are expressed as a dictionary with member names as keys.
     """
     def __get__(self, struct, owner=None):
-        member_names = struct.members.names
-        return dict(zip(member_names, [struct[m].value for m in member_names]))
+        if struct is None:
+            return self
+
+        # Values of base data type members are converted directly from
+        # their XML elements, in the same manner as ArrayValue, without
+        # creating access objects for each member. Other members, such
+        # as arrays and nested structures, are acquired from the member
+        # container, bypassing the validation of Structure.__getitem__().
+        value = {}
+        for e in struct.element:
+            name = e.attrib.get('Name')
+            if name is None:
+                continue
+
+            if e.tag == 'DataValueMember':
+                data_class = base_data_types.get(e.attrib['DataType'])
+                if data_class is not None:
+                    value[name] = data_class.value.from_xml(e.attrib['Value'])
+                    continue
+
+            value[name] = struct.members[name].value
+
+        return value
 
     def __set__(self, struct, value):
         if not isinstance(value, dict):
             raise TypeError('Value must be a dictionary')
-        for m in value.keys():
-            struct[m].value = value[m]
+        for name, member_value in value.items():
+            struct[name].value = member_value
         struct.tag.clear_raw_data()
 
 
@@ -537,6 +812,8 @@ class StructureNames(object):
 
 class Structure(Data):
     """Accessor class for structured data types."""
+    __slots__ = ('members',)
+
     value = StructureValue()
     names = StructureNames()
 
@@ -550,9 +827,11 @@ class Structure(Data):
         if element.tag == 'Element':
             self.element = element.find('Structure')
 
-        self.members = dom.ElementDict(self.element, 'Name', base_data_types,
-                                   'DataType', Structure,
-                                   value_args=[tag, self])
+        # Member names are interned so lookups with names given as string
+        # literals, which are also interned, match keys by identity.
+        self.members = dom.ElementDict(self.element, 'Name', create_member,
+                                       key_type=intern,
+                                       value_args=[tag, self])
 
     def __getitem__(self, member):
         """Indexing a structure yields an individual member."""
@@ -562,19 +841,55 @@ class Structure(Data):
 
 
 class ArrayValue(object):
-    """Descriptor class for accessing multiple values in an array."""
+    """Descriptor class for accessing multiple values in an array.
+
+    Values in the last dimension of arrays of base data types are converted
+    directly from their XML elements instead of creating access objects
+    for each element.
+    """
     def __get__(self, array, owner=None):
         dim = len(array.shape) - len(array.address) - 1
+        scalar = getattr(array.data_class, 'value', None)
+        if (dim == 0) and isinstance(scalar, ScalarValue):
+            elements = array.get_row_elements(array.shape[dim])
+            raw = [e.attrib['Value'] for e in elements]
+            return list(map(scalar.from_xml, raw))
+
+        # Other last-dimension members are retrieved directly instead of
+        # through Array.__getitem__(), which would validate and extend
+        # the address for every index.
+        if dim == 0:
+            members = array.get_row_members(array.shape[dim])
+            return [m.value for m in members]
+
         return [array[i].value for i in range(array.shape[dim])]
 
     def __set__(self, array, value):
-        if not isinstance(value, list):
+        # Typed arrays are converted to a list with a single C-level call.
+        if isinstance(value, typed_array.array):
+            value = value.tolist()
+        elif not isinstance(value, list):
             raise TypeError('Value must be a list')
-        if len(value) > array.shape[len(array.shape) - len(array.address) - 1]:
+        dim = len(array.shape) - len(array.address) - 1
+        if len(value) > array.shape[dim]:
             raise IndexError('Source list is too large')
 
-        for i in range(len(value)):
-            array[i].value = value[i]
+        scalar = getattr(array.data_class, 'value', None)
+        if (dim == 0) and isinstance(scalar, ScalarValue):
+            # Validate all values before modifying any elements.
+            raw = scalar.to_xml_list(array.data_class, value)
+            elements = array.get_row_elements(len(value))
+            for e, r in zip(elements, raw):
+                e.attrib['Value'] = r
+
+        elif dim == 0:
+            members = array.get_row_members(len(value))
+            for m, v in zip(members, value):
+                m.value = v
+
+        else:
+            for i in range(len(value)):
+                array[i].value = value[i]
 
         array.tag.clear_raw_data()
 
@@ -597,15 +912,31 @@ class ArrayDescription(Comment):
 
 
 class ArrayShape(object):
-    """Descriptor class to acquire an array's dimensions."""
+    """Descriptor class to acquire an array's dimensions.
+
+    The parsed shape is cached in the array object along with the
+    attribute string it was parsed from, in the same manner as
+    ScalarValue, so indexing does not parse the attribute for every access.
+    """
     def __get__(self, array, owner=None):
-        dims = [int(d) for d in array.element.attrib['Dimensions'].split(',')]
+        raw = array.element.attrib['Dimensions']
+        try:
+            cached_raw, shape = array.cached_shape
+        except AttributeError:
+            pass
+        else:
+            if cached_raw is raw:
+                return shape
+
+        dims = [int(d) for d in raw.split(',')]
 
         # Dimensions are stored most-significant first(Dim2, Dim1, Dim0) in the
         # XML attribute; reversing them makes DimX = shape[X].
         dims.reverse()
 
-        return tuple(dims)
+        shape = tuple(dims)
+        array.cached_shape = (raw, shape)
+        return shape
 
     def __set__(self, array, value):
         # Prevent resizing UDT array members.
@@ -634,58 +965,157 @@ class ArrayShape(object):
 
 class Array(Data):
     """Access object for arrays of any data type."""
+    __slots__ = ('data_class', 'address', 'members', 'subarrays',
+                 'cached_shape')
+
     value = ArrayValue()
     description = ArrayDescription()
     shape = ArrayShape()
 
-    def __init__(self, data_class, element, tag, parent=None, address=[]):
+    def __init__(self, data_class, element, tag, parent=None, address=(),
+                 members=None, subarrays=None):
         Data.__init__(self, element, tag, parent)
         self.data_class = data_class
         self.address = address
 
+        # Subarrays are given the member container and subarray dictionary
+        # of the array they were created from so the array's elements are
+        # only indexed once, and each subarray is only created once,
+        # regardless of the number of subarrays.
+        if members is not None:
+            self.members = members
+            self.subarrays = subarrays
+            return
+
+        # Subarray objects keyed by address.
+        self.subarrays = {}
+
         # Array members are identified in XML by the Index attribute,
         # not element order, and may include more than one dimension, so
         # the usual list-type access does not suffice. The object initialized
         # here builds a dictionary of child elements(array members) keyed
         # by the Index attribute that can then be accessed with traditional
-        # array notation.
+        # array notation. Keys are tuples of integers parsed from the
+        # attribute so addresses can be looked up without formatting strings.
+        # The dictionary is not built until a member is first accessed.
         self.members = dom.ElementDict(self.element, 'Index', self.data_class,
+                                       key_type=parse_index,
                                        value_args=[self.tag, self])
 
     def __getitem__(self, index):
         """Returns an access object for the given index.
 
-        Multidimensional arrays will return new Array objects with the
+        Multidimensional arrays will return Array objects with the
         accumulated address until all dimensions are satisfied, which
-        will then return the data access object for that item.
+        will then return the data access object for that item. Array
+        objects for each address are retained and reused.
+
+        A tuple of indices may also be given to address several
+        dimensions in a single step.
         """
+        if isinstance(index, tuple):
+            return self.get_address(index)
+
         if not isinstance(index, int):
             raise TypeError('Array indices must be integers')
 
-        # Add the given index to the current accumulated address.
-        dim = len(self.shape) - len(self.address) - 1
-        if (index < 0) or (index >= self.shape[dim]):
+        # Add the given index to the current accumulated address. Indices
+        # are given most-significant first, the same order they are
+        # listed in Index attributes, so the complete address is directly
+        # usable as a member key.
+        shape = self.shape
+        dim = len(shape) - len(self.address) - 1
+        if (index < 0) or (index >= shape[dim]):
             raise IndexError('Array index out of range')
-        new_address = list(self.address)
-        new_address.insert(0, index)
+        new_address = self.address + (index,)
 
         # If the newly formed address set satisifies all dimensions
         # return an access object for the member.
-        if len(new_address) == len(self.shape):
-            # Address values are reversed because the display order is
-            # most-significant first.
-            new_address.reverse()
-
-            key = "[{0}]".format(','.join([str(i) for i in new_address]))
-            return self.members[key]
+        if dim == 0:
+            return self.members[new_address]
 
         # The new address does not yet specify a single element if the key
-        # was not found. Return a new array access object to handle
-        # access to the new address by instantiating the data type,
-        # which will result in an Array instance through Data.__new__().
-        else:
-            return self.data_class(self.element, self.tag, self.parent,
-                                   new_address)
+        # was not found. Return an array access object to handle
+        # access to the new address, creating one if necessary.
+        try:
+            return self.subarrays[new_address]
+        except KeyError:
+            pass
+
+        subarray = type(self)(self.data_class, self.element, self.tag,
+                              self.parent, new_address, self.members,
+                              self.subarrays)
+
+        # Share the parsed shape so the dimensions are only parsed once.
+        subarray.cached_shape = self.cached_shape
+
+        self.subarrays[new_address] = subarray
+        return subarray
+
+    def get_address(self, indices):
+        """Returns an access object for a tuple of indices.
+
+        All indices are validated in a single pass, and members addressed
+        by a complete set of indices are looked up directly without
+        creating intermediate subarray objects.
+        """
+        shape = self.shape
+        dim = len(shape) - len(self.address)
+        if not 0 < len(indices) <= dim:
+            raise IndexError('Invalid number of array indices')
+
+        for index in indices:
+            if not isinstance(index, int):
+                raise TypeError('Array indices must be integers')
+            dim -= 1
+            if (index < 0) or (index >= shape[dim]):
+                raise IndexError('Array index out of range')
+
+        if dim == 0:
+            return self.members[self.address + indices]
+
+        # Partial addresses yield a subarray, reached one index at a time
+        # so it is created and cached in the same way as with separate
+        # subscripts.
+        subarray = self
+        for index in indices:
+            subarray = subarray[index]
+        return subarray
+
+    def as_array(self):
+        """Returns the values of the last dimension as a typed array.
+
+        The returned array.array uses a type code suitable for the
+        array's base data type. Only arrays of base data types, addressed
+        to the last dimension, may be converted.
+        """
+        typecode = getattr(self.data_class, 'typecode', None)
+        dim = len(self.shape) - len(self.address) - 1
+        if (typecode is None) or (dim != 0):
+            raise TypeError('Only the last dimension of base data type '
+                            'arrays may be converted to typed arrays')
+        return typed_array.array(typecode, self.value)
+
+    def get_row_elements(self, count):
+        """Returns XML elements from the last dimension.
+
+        The returned list contains elements for the first count indices
+        of the last dimension, following the current address.
+        """
+        return self.members.get_elements(self.get_row_keys(count))
+
+    def get_row_members(self, count):
+        """Returns access objects for members of the last dimension.
+
+        Members are selected in the same manner as get_row_elements().
+        """
+        members = self.members
+        return [members[k] for k in self.get_row_keys(count)]
+
+    def get_row_keys(self, count):
+        """Generates member keys for the first count last-dimension indices."""
+        prefix = self.address
+        return [prefix + (i,) for i in range(count)]
 
     def resize(self, new_shape):
         """Alters the array's size."""
@@ -698,8 +1128,13 @@ class Array(Data):
         self.remove_elements()
 
         # Generate new elements based on a new set of indices.
-        indices = self.build_new_indices(new_shape)
-        [self.append_element(template, i) for i in indices]
+        self.append_elements(template, self.build_new_indices(new_shape))
+
+        # Discard access objects for the old elements, which may not
+        # be detected by a change in the number of elements, along with
+        # subarrays, which may no longer be valid for the new shape.
+        self.members.reset()
+        self.subarrays.clear()
 
     def set_dimensions(self, shape):
         """Updates the Dimensions attributes with a given shape.
@@ -707,33 +1142,72 @@ class Array(Data):
         Array tag elements have two dimension attributes: one in the top-level
         Tag element, and another in the Array child element.
         """
-        new = list([str(x) for x in shape])
-        new.reverse() # Logix lists dimensions most-significant first.
+        # Logix lists dimensions most-significant first.
+        new = [str(x) for x in reversed(shape)]
 
         # Top-level Tag element uses space for separators.
-        value = ' '.join(new)
-        self.tag.element.attrib['Dimensions'] = value
+        self.tag.element.attrib['Dimensions'] = ' '.join(new)
 
         # Array element uses comma for separators.
-        value = ','.join(new)
-        self.element.attrib['Dimensions'] = value
+        self.element.attrib['Dimensions'] = ','.join(new)
 
     def remove_elements(self):
-        """Deletes all (array)Element elements."""
-        [self.element.remove(e) for e in self.element.findall('*')]
+        """Deletes all (array)Element elements.
+
+        The children are removed with a single slice deletion; removing
+        each one individually requires a search for every child.
+        """
+        del self.element[:]
 
     def build_new_indices(self, shape):
-        """Constructs a set of all indices for a given array shape."""
-        indices = [range(x) for x in shape]
+        """Generates Index attribute strings for a given array shape.
+
+        Each dimension's index values are converted to strings once, and
+        the product of those is joined for each element, instead of
+        converting every index of every element.
+        """
+        indices = [[str(i) for i in range(x)] for x in shape]
         indices.reverse() # Indices are listed most-significant first.
-        return itertools.product(*indices)
+        for index in itertools.product(*indices):
+            yield "[{0}]".format(','.join(index))
+
+    def append_elements(self, template, indices):
+        """Generates and appends new elements from a template.
+
+        One element is created for each Index attribute string in
+        indices, and all are appended with a single call.
+        """
+        # Templates without children, i.e., members of base data type
+        # arrays, are cloned by creating a new element from the template's
+        # attributes with the new index already in place, which is cheaper
+        # than copying and then modifying each one.
+        if len(template) == 0:
+            attrib = dict(template.attrib)
+            new_elements = []
+            for index in indices:
+                attrib['Index'] = index
+                new = template.makeelement(template.tag, attrib)
+                new.text = template.text
+                new.tail = template.tail
+                new_elements.append(new)
+            self.element.extend(new_elements)
+            return
+
+        # Copy the template with the element's own __deepcopy__ method,
+        # provided by the C ElementTree implementation, bypassing the
+        # dispatch overhead of copy.deepcopy() for every new element.
+        try:
+            clone = template.__deepcopy__
+        except AttributeError:
+            clone = lambda memo: copy.deepcopy(template, memo)
 
-    def append_element(self, template, index):
-        """Generates and appends a new element from a template."""
-        new = copy.deepcopy(template)
-        index_attr = "[{0}]".format(','.join([str(i) for i in index]))
-        new.attrib['Index'] = index_attr
-        self.element.append(new)
+        new_elements = []
+        for index in indices:
+            new = clone({})
+            new.attrib['Index'] = index
+            new_elements.append(new)
+
+        self.element.extend(new_elements)
 
 
 class ArrayMember(Array):
@@ -743,6 +1217,8 @@ class ArrayMember(Array):
     comments for subarrays is unnecessary as array members may only be
     one-dimensional.
     """
+    __slots__ = ()
+
     description = Comment()
 
     
@@ -751,3 +1227,41 @@ base_data_types = {'SINT':SINT,
                    'DINT':DINT,
                    'BOOL':BOOL,
                    'REAL':REAL}
+
+# Access object classes for XML elements containing arrays, keyed by
+# element name. Two types are possible depending on if the array is a
+# structure member.
+array_types = {'Array':Array,
+               'ArrayMember':ArrayMember}
+
+
+def parse_index(index):
+    """Converts an array member's Index attribute into a tuple of integers.
+
+    For example, '[1,2]' yields (1, 2); the most-significant index remains
+    first, as it is in the attribute.
+    """
+    return tuple(map(int, index[1:-1].split(',')))
+
+
+def create_data(data_class, element, tag, parent=None):
+    """Creates an access object for a decorated data XML element.
+
+    Array elements yield an array access object for the given data type;
+    all other elements are accessed directly with an instance of the
+    data type.
+    """
+    array_type = array_types.get(element.tag)
+    if array_type is not None:
+        return array_type(data_class, element, tag, parent)
+    return data_class(element, tag, parent)
+
+
+def create_member(element, tag, parent):
+    """Creates an access object for a structure member.
+
+    The member's data type is selected by its DataType attribute, with
+    any type not in the set of base types assumed to be a structure.
+    """
+    data_class = base_data_types.get(element.attrib['DataType'], Structure)
+    return create_data(data_class, element, tag, parent)
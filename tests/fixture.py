@@ -5,26 +5,22 @@ a single output file for final validation by RSLogix.
 
 import io
 import l5x
-import xml.dom.minidom
 import xml.etree.ElementTree as ElementTree
 
 
 def parse_xml(xml_str):
-    """Parses XML from a string."""
-    class Parser(l5x.Project):
-        """Use the Project class to handle CDATA conversion."""
-        def __init__(self, s):
-            # Swap out CDATA sections before parsing.
-            cdata_replaced = self.convert_to_cdata_element(s)
+    """Parses XML from a string.
 
-            # The (unicode) string needs to be converted back to a series
-            # of bytes before ElementTree parses it.
-            encoded = cdata_replaced.encode('UTF-8')
+    The project parser is used so CDATA sections are converted into
+    elements the same way as when a project is read.
+    """
+    parser = l5x.project.Parser()
 
-            self.doc = ElementTree.fromstring(encoded)
+    # The (unicode) string needs to be converted to a series of bytes
+    # before it is parsed.
+    parser.feed(xml_str.encode('UTF-8'))
 
-    parser = Parser(xml_str)
-    return parser.doc
+    return parser.close()
 
 
 def string_to_project(s):
@@ -46,23 +42,22 @@ def create_project(*populate):
     callbacks are used to add whatever additional content needed by particular
     test cases.
     """
-    imp = xml.dom.minidom.getDOMImplementation()
-    doc = imp.createDocument(None, 'RSLogix5000Content', None)
-    root = doc.documentElement
+    class MockProject(l5x.Project):
+        """Project built from an existing element tree instead of a file."""
+        def parse(self, root):
+            self.doc = root
 
-    controller = doc.createElement('Controller')
-    root.appendChild(controller)
+    root = ElementTree.Element('RSLogix5000Content')
+    controller = ElementTree.SubElement(root, 'Controller')
 
     # Create the top-level elements under the Controller.
     for tag in ['Tags', 'Programs', 'Modules']:
-        element = doc.createElement(tag)
-        controller.appendChild(element)
+        ElementTree.SubElement(controller, tag)
 
-    # Dispatch the document to the populate callbacks to allow additional
-    # content to be added before serialization.
-    [f(doc) for f in populate]
+    # Dispatch the root element to the populate callbacks to allow additional
+    # content to be added. The tree is handed directly to the project,
+    # avoiding a round trip through serialization and parsing.
+    for f in populate:
+        f(root)
 
-    # Serialize the document so it can be parsed as a simulated XML file.
-    xml_str = root.toxml('UTF-8').decode('UTF-8')
-    buf = io.StringIO(xml_str)
-    return l5x.Project(buf)
+    return MockProject(root)
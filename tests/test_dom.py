@@ -60,6 +60,105 @@ class ElementDict(unittest.TestCase):
         d = dom.ElementDict(parent, 'key', self.Dummy, key_type=int)
         self.assertIs(d[42].element, child)
 
+    def test_get_elements(self):
+        """Confirm a list of elements is returned for a series of keys."""
+        parent = ElementTree.Element('parent')
+        foo = ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        bar = ElementTree.SubElement(parent, 'child', {'key':'bar'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        self.assertEqual(d.get_elements(['bar', 'foo']), [bar, foo])
+
+    def test_get_elements_not_found(self):
+        """Confirm a KeyError is raised if any key doesn't exist."""
+        parent = ElementTree.Element('parent')
+        ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        with self.assertRaises(KeyError):
+            d.get_elements(['foo', 'bar'])
+
+    def test_value_retained(self):
+        """Confirm the same value object is returned for repeated lookups."""
+        parent = ElementTree.Element('parent')
+        ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        self.assertIs(d['foo'], d['foo'])
+
+    def test_added_child(self):
+        """Confirm children added after a previous lookup are found."""
+        parent = ElementTree.Element('parent')
+        ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        d['foo']
+        child = ElementTree.SubElement(parent, 'child', {'key':'bar'})
+        self.assertIs(d['bar'].element, child)
+
+    def test_removed_child(self):
+        """Confirm children removed after a previous lookup are not found."""
+        parent = ElementTree.Element('parent')
+        child = ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        d['foo']
+        parent.remove(child)
+        with self.assertRaises(KeyError):
+            d['foo']
+
+    def test_reset(self):
+        """Confirm replaced children are found after a reset."""
+        parent = ElementTree.Element('parent')
+        old = ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        d['foo']
+        parent.remove(old)
+        new = ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d.reset()
+        self.assertIs(d['foo'].element, new)
+
+    def test_replaced_child(self):
+        """Confirm a child replaced by one with a different key is found."""
+        parent = ElementTree.Element('parent')
+        old = ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        d['foo']
+        parent.remove(old)
+        new = ElementTree.SubElement(parent, 'child', {'key':'bar'})
+        self.assertIs(d['bar'].element, new)
+        with self.assertRaises(KeyError):
+            d['foo']
+
+    def test_replaced_child_same_key(self):
+        """Confirm a child replaced by one with the same key is found."""
+        parent = ElementTree.Element('parent')
+        old = ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        d['foo']
+        parent.remove(old)
+        new = ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        self.assertIs(d['foo'].element, new)
+        self.assertEqual(d.get_elements(['foo']), [new])
+
+    def test_renamed_key(self):
+        """Confirm a child is found by its new key after being renamed."""
+        parent = ElementTree.Element('parent')
+        child = ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        d['foo']
+        child.attrib['key'] = 'bar'
+        self.assertIs(d['bar'].element, child)
+        with self.assertRaises(KeyError):
+            d['foo']
+        with self.assertRaises(KeyError):
+            d.get_elements(['foo'])
+
+    def test_value_retained_rebuild(self):
+        """Confirm value objects survive an index rebuild for other keys."""
+        parent = ElementTree.Element('parent')
+        ElementTree.SubElement(parent, 'child', {'key':'foo'})
+        d = dom.ElementDict(parent, 'key', self.Dummy)
+        value = d['foo']
+        ElementTree.SubElement(parent, 'child', {'key':'bar'})
+        d['bar']
+        self.assertIs(d['foo'], value)
+
     def test_value_read_only(self):
         """
         Confirm attempting to assign a different value raises an exception.
@@ -4,6 +4,9 @@ Unit tests for the top-level project module.
 
 import l5x
 import io
+import os
+import shutil
+import tempfile
 import unittest
 from tests import fixture
 import xml.etree.ElementTree as ElementTree
@@ -32,16 +35,120 @@ class Parse(unittest.TestCase):
         with self.assertRaises(l5x.InvalidFile):
             l5x.Project(buf)
 
+    def test_doctype(self):
+        """Ensure an exception is raised if the document contains a DTD."""
+        s = u"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<!-- comment -->
+<!DOCTYPE RSLogix5000Content [
+<!ENTITY foo "bar">
+]>
+<RSLogix5000Content><Controller/></RSLogix5000Content>"""
+        buf = io.StringIO(s)
+        with self.assertRaises(l5x.InvalidFile):
+            l5x.Project(buf)
 
-class CDATARemoval(unittest.TestCase):
-    """Tests for replacing CDATA sections with elements."""
+
+class ParseFile(unittest.TestCase):
+    """Tests for parsing projects from files."""
     def setUp(self):
-        """
-        Creates a dummy project. This is only needed to get a Project
-        instance to test the replace_cdata method.
-        """
-        self.project = fixture.create_project()
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, 'test.L5X')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_parse(self):
+        """Confirm a project is read from a file."""
+        self.create_file(u"""<?xml version="1.0" encoding="UTF-8"?>
+<RSLogix5000Content>
+<Controller CommPath="\u00e9">
+<Description><![CDATA[&<>\u00e9]]></Description>
+<Tags/>
+<Programs/>
+<Modules/>
+</Controller>
+</RSLogix5000Content>""")
+        prj = l5x.Project(self.filename)
+        self.assertEqual(prj.controller.comm_path, u'\u00e9')
+        desc = prj.doc.find('Controller/Description/CDATAContent')
+        self.assertEqual(desc.text, u'&<>\u00e9')
+
+    def test_chunk_boundaries(self):
+        """Confirm content split into many small chunks is parsed."""
+        self.create_file(u"""<RSLogix5000Content>
+<Controller CommPath="\u00e9\u00e9">
+<Description><![CDATA[\u00e9&\u00e9]]></Description>
+<Tags/>
+</Controller>
+</RSLogix5000Content>""")
+        original_size = l5x.project.Parser.CHUNK_SIZE
+        l5x.project.Parser.CHUNK_SIZE = 1
+        try:
+            prj = l5x.Project(self.filename)
+        finally:
+            l5x.project.Parser.CHUNK_SIZE = original_size
+        self.assertEqual(prj.controller.comm_path, u'\u00e9\u00e9')
+        desc = prj.doc.find('Controller/Description/CDATAContent')
+        self.assertEqual(desc.text, u'\u00e9&\u00e9')
+
+    def test_empty_cdata(self):
+        """Confirm an empty CDATA section is parsed to an empty element."""
+        self.create_file(u"""<RSLogix5000Content>
+<Controller>
+<Description><![CDATA[]]></Description>
+<Tags/>
+</Controller>
+</RSLogix5000Content>""")
+        prj = l5x.Project(self.filename)
+        desc = prj.doc.find('Controller/Description/CDATAContent')
+        self.assertIsNone(desc.text)
+
+    def test_empty_file(self):
+        """Ensure an exception is raised for an empty file."""
+        self.create_file(u'')
+        with self.assertRaises(l5x.InvalidFile):
+            l5x.Project(self.filename)
+
+    @unittest.skipUnless(os.path.isdir('/dev/fd'), 'Requires /dev/fd.')
+    def test_pipe(self):
+        """Confirm a project is read from a source that cannot be mapped."""
+        prj = self.parse_pipe(b"""<RSLogix5000Content>
+<Controller CommPath="foo">
+<Description><![CDATA[bar]]></Description>
+<Tags/>
+</Controller>
+</RSLogix5000Content>""")
+        self.assertEqual(prj.controller.comm_path, 'foo')
+        desc = prj.doc.find('Controller/Description/CDATAContent')
+        self.assertEqual(desc.text, 'bar')
+
+    @unittest.skipUnless(os.path.isdir('/dev/fd'), 'Requires /dev/fd.')
+    def test_empty_pipe(self):
+        """Ensure an exception is raised for an empty unmappable source."""
+        with self.assertRaises(l5x.InvalidFile):
+            self.parse_pipe(b'')
+
+    def parse_pipe(self, content):
+        """Parses a project from a pipe containing the given content."""
+        read_fd, write_fd = os.pipe()
+        try:
+            os.write(write_fd, content)
+            os.close(write_fd)
+            write_fd = None
+            return l5x.Project('/dev/fd/{0}'.format(read_fd))
+        finally:
+            os.close(read_fd)
+            if write_fd is not None:
+                os.close(write_fd)
+
+    def create_file(self, s):
+        """Writes the source document to the test file."""
+        with io.open(self.filename, 'w', encoding='UTF-8') as f:
+            f.write(s)
 
+
+class CDATARemoval(unittest.TestCase):
+    """Tests for replacing CDATA sections with elements."""
     def test_CDATA_to_element(self):
         """Confirm CDATA sections are converted to elements."""
         src = '<root>' + self.generate_cdata('foo') + '</root>'
@@ -87,11 +194,12 @@ class CDATARemoval(unittest.TestCase):
 
     def convert_parse(self, src):
         """
-        Passes the test string through CDATA removal and parses the
-        result into an XML document.
+        Parses the test string with the project parser, which converts
+        CDATA sections into elements, and returns the root element.
         """
-        doc = self.project.convert_to_cdata_element(src)
-        return ElementTree.fromstring(doc)
+        parser = l5x.project.Parser()
+        parser.feed(src.encode('UTF-8'))
+        return parser.close()
 
     def generate_cdata(self, text):
         """Creates a CDATA section."""
@@ -199,31 +307,109 @@ class ContentElements(unittest.TestCase):
         prj = fixture.create_project(self.add_mock_controller_path)
         self.assertEqual(prj.controller.comm_path, 'this is the controller')
 
-    def add_mock_controller_path(self, doc):
+    def add_mock_controller_path(self, root):
         """Creates a dummy controller path for the controller test case."""
-        controller = doc.getElementsByTagName('Controller')[0]
-        controller.setAttribute('CommPath', 'this is the controller')
+        controller = root.find('Controller')
+        controller.attrib['CommPath'] = 'this is the controller'
 
     def test_programs(self):
         """Confirm access to the set of programs."""
         prj = fixture.create_project(self.add_mock_program)
         prj.programs['Some Program']
 
-    def add_mock_program(self, doc):
+    def test_programs_cached(self):
+        """Confirm the set of programs is only created once."""
+        prj = fixture.create_project(self.add_mock_program)
+        self.assertIs(prj.programs, prj.programs)
+
+    def add_mock_program(self, root):
         """Creates a dummy program for the programs test case."""
-        parent = doc.getElementsByTagName('Programs')[0]
-        prog = doc.createElement('Program')
-        prog.setAttribute('Name', 'Some Program')
-        parent.appendChild(prog)
+        parent = root.find('Controller/Programs')
+        ElementTree.SubElement(parent, 'Program', {'Name': 'Some Program'})
 
     def test_modules(self):
         """Confirm access to the set of I/O modules."""
         prj = fixture.create_project(self.add_mock_module)
         prj.modules['SpamModule']
 
-    def add_mock_module(self, doc):
+    def test_modules_cached(self):
+        """Confirm the set of modules is only created once."""
+        prj = fixture.create_project(self.add_mock_module)
+        self.assertIs(prj.modules, prj.modules)
+
+    def add_mock_module(self, root):
         """Creates a dummy module for the modules test case."""
-        parent = doc.getElementsByTagName('Modules')[0]
-        mod = doc.createElement('Module')
-        mod.setAttribute('Name', 'SpamModule')
-        parent.appendChild(mod)
+        parent = root.find('Controller/Modules')
+        ElementTree.SubElement(parent, 'Module', {'Name': 'SpamModule'})
+
+
+class Write(unittest.TestCase):
+    """Tests for writing a project to an output file."""
+    def setUp(self):
+        self.project = fixture.create_project(self.add_mock_comments)
+
+    def add_mock_comments(self, root):
+        """Adds a program with several CDATA elements."""
+        parent = root.find('Controller/Programs')
+        prog = ElementTree.SubElement(parent, 'Program', {'Name': 'prog'})
+        for i in range(100):
+            desc = ElementTree.SubElement(prog, 'Description')
+            cdata = ElementTree.SubElement(desc, 'CDATAContent')
+            cdata.text = u"comment {0} \u00e9&<>".format(i)
+        desc = ElementTree.SubElement(prog, 'Description')
+        ElementTree.SubElement(desc, 'CDATAContent')
+
+    def test_cdata_sections(self):
+        """Confirm CDATA elements are written as CDATA sections."""
+        doc = self.write()
+        prog = doc.getElementsByTagName('Program')[0]
+        desc = prog.getElementsByTagName('Description')
+        for i in range(100):
+            self.assert_cdata_content(desc[i], u"comment {0} \u00e9&<>".format(i))
+
+    def test_chunk_boundaries(self):
+        """Confirm output is unchanged when split into many small chunks."""
+        expected = self.write_raw()
+        original_size = l5x.project.CDATAWriter.CHUNK_SIZE
+        for size in [1, 7, 64]:
+            l5x.project.CDATAWriter.CHUNK_SIZE = size
+            try:
+                self.assertEqual(self.write_raw(), expected)
+            finally:
+                l5x.project.CDATAWriter.CHUNK_SIZE = original_size
+
+    def test_file(self):
+        """Confirm writing to a file yields the same output as a buffer."""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'test.L5X')
+            self.project.write(filename)
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read(), self.write_raw())
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_empty_element(self):
+        """Confirm an empty CDATA element is written as a CDATA section."""
+        raw = self.write_raw()
+        self.assertIn(b'<Description><![CDATA[]]></Description>', raw)
+
+    def write_raw(self):
+        """Writes the project and returns the raw output."""
+        buf = io.BytesIO()
+        self.project.write(buf)
+        return buf.getvalue()
+
+    def write(self):
+        """Writes the project and parses the output."""
+        return xml.dom.minidom.parseString(self.write_raw())
+
+    def assert_cdata_content(self, element, text):
+        """
+        Confirms an element contains a single CDATA section with a
+        given text content.
+        """
+        cdata_nodes = [n for n in element.childNodes
+                       if n.nodeType == n.CDATA_SECTION_NODE]
+        self.assertEqual(len(cdata_nodes), 1)
+        self.assertEqual(cdata_nodes[0].data, text)
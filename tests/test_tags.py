@@ -2,6 +2,7 @@
 Unittests for tag access.
 """
 
+import array
 import copy
 import ctypes
 from tests import fixture
@@ -12,6 +13,11 @@ import math
 import unittest
 import xml.etree.ElementTree as ElementTree
 
+try:
+    from sys import intern
+except ImportError: # Python 2.7 provides intern() as a built-in.
+    pass
+
 
 class Scope(unittest.TestCase):
     """Tests for a tag scope."""
@@ -65,6 +71,18 @@ class Scope(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.scope.tags['not_a_tag']
 
+    def test_replaced_tag(self):
+        """Confirm tags replaced directly in the XML are found."""
+        tags = self.scope.element.find('Tags')
+        old = self.scope.tags['foo']
+        tags.remove(old.element)
+        new = copy.deepcopy(old.element)
+        new.attrib['Name'] = 'spam'
+        tags.append(new)
+        self.assertIs(self.scope.tags['spam'].element, new)
+        with self.assertRaises(KeyError):
+            self.scope.tags['foo']
+
 
 class Tag(object):
     """Base class for testing a tag."""
@@ -93,6 +111,11 @@ class Tag(object):
         with self.assertRaises(AttributeError):
             self.tag.data_type = 'fail'
 
+    def test_no_instance_dict(self):
+        """Confirm tag and data objects do not carry instance dictionaries."""
+        self.assertFalse(hasattr(self.tag, '__dict__'))
+        self.assertFalse(hasattr(self.tag.data, '__dict__'))
+
     def test_remove_raw_data(self):
         """Ensure setting top-level tag value removes undecorated data."""
         self.tag.value = self.tag.value
@@ -115,6 +138,43 @@ class Tag(object):
         return children[0]
 
 
+class DataElements(unittest.TestCase):
+    """Tests for locating a tag's Data elements."""
+    def test_no_decorated_data(self):
+        """Confirm an exception is raised without decorated data."""
+        e = fixture.parse_xml("""<Tag Name="dint" TagType="Base" DataType="DINT" Radix="Decimal" Constant="false" ExternalAccess="Read/Write">
+<Data>00 00 00 00</Data>
+</Tag>""")
+        with self.assertRaises(RuntimeError):
+            l5x.tag.Tag(e, None)
+
+    def test_clear_multiple_raw_data(self):
+        """Confirm all undecorated data elements are removed."""
+        e = fixture.parse_xml("""<Tag Name="dint" TagType="Base" DataType="DINT" Radix="Decimal" Constant="false" ExternalAccess="Read/Write">
+<Data>00 00 00 00</Data>
+<Data Format="L5K">0</Data>
+<Data Format="Decorated">
+<DataValue DataType="DINT" Radix="Decimal" Value="0"/>
+</Data>
+</Tag>""")
+        tag = l5x.tag.Tag(e, None)
+        tag.value = 1
+        data = tag.element.findall('Data')
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0].attrib['Format'], 'Decorated')
+
+
+class ParseIndex(unittest.TestCase):
+    """Unit tests for converting array Index attributes."""
+    def test_single(self):
+        """Confirm a single-dimensional index yields a one-item tuple."""
+        self.assertEqual(l5x.tag.parse_index('[42]'), (42,))
+
+    def test_multiple(self):
+        """Confirm multi-dimensional indices retain their order."""
+        self.assertEqual(l5x.tag.parse_index('[1,2,3]'), (1, 2, 3))
+
+
 class Data(unittest.TestCase):
     """Unit tests for the base Data class."""
     class DummyType(l5x.tag.Data):
@@ -122,20 +182,28 @@ class Data(unittest.TestCase):
         pass
 
     def test_array(self):
-        """Confirm array data is delegated to an Array object."""
+        """Confirm array data is accessed with an Array object."""
         element = fixture.parse_xml("""<Array DataType="DINT" Dimensions="1" Radix="Decimal">
 <Element Index="[0]" Value="0"/>
 </Array>""")
-        data = self.DummyType(element, None)
+        data = l5x.tag.create_data(self.DummyType, element, None)
         self.assertIsInstance(data, l5x.tag.Array)
+        self.assertIs(data.data_class, self.DummyType)
 
     def test_array_member(self):
-        """Confirm array member data is delegated to an ArrayMember object."""
+        """Confirm array member data is accessed with an ArrayMember object."""
         element = fixture.parse_xml("""<ArrayMember Name="dint_array" DataType="DINT" Dimensions="1" Radix="Decimal">
 <Element Index="[0]" Value="0"/>
 </ArrayMember>""")
-        data = self.DummyType(element, None)
+        data = l5x.tag.create_data(self.DummyType, element, None)
         self.assertIsInstance(data, l5x.tag.ArrayMember)
+        self.assertIs(data.data_class, self.DummyType)
+
+    def test_non_array(self):
+        """Confirm non-array data is accessed with the given data type."""
+        element = fixture.parse_xml("""<DataValue DataType="DINT" Radix="Decimal" Value="0"/>""")
+        data = l5x.tag.create_data(self.DummyType, element, None)
+        self.assertIs(type(data), self.DummyType)
 
     def test_name_operand(self):
         """Confirm data identified by Name are separated by dots."""
@@ -163,6 +231,14 @@ class Data(unittest.TestCase):
 
         self.assertEqual(submember.operand, '[42][0]')
 
+    def test_operand_interned(self):
+        """Confirm equal operands share a single string object."""
+        parent = self.DummyType(ElementTree.Element('udt'), None)
+        e = ElementTree.SubElement(parent.element, 'member', {'Name':'foo'})
+        first = self.DummyType(e, None, parent)
+        second = self.DummyType(e, None, parent)
+        self.assertIs(first.operand, second.operand)
+
 
 class Integer(Tag):
     """Base class for testing integer data types."""
@@ -170,12 +246,26 @@ class Integer(Tag):
         """Test len() returns number of bits."""
         self.assertEqual(len(self.tag), self.bits)
 
+    def test_as_array(self):
+        """Confirm scalar tags cannot be converted to typed arrays."""
+        with self.assertRaises(TypeError):
+            self.tag.as_array()
+
     def test_value_read(self):
         """Verify value read returns the attribute converted to an integer."""
         value = 42
         self.set_value(value)
         self.assertEqual(self.tag.value, value)
 
+    def test_value_reread(self):
+        """Verify a value altered after a previous read is returned."""
+        self.set_value(42)
+        self.tag.value
+        self.set_value(43)
+        self.assertEqual(self.tag.value, 43)
+        self.tag.value = 44
+        self.assertEqual(self.tag.value, 44)
+
     def test_value_write(self):
         """Verify new values are properly written to the correct attribute."""
         self.tag.value = 42
@@ -187,6 +277,19 @@ class Integer(Tag):
         with self.assertRaises(TypeError):
             self.tag.value = '42'
 
+    def test_value_write_bool(self):
+        """Verify setting the value to a boolean raises an exception."""
+        with self.assertRaises(TypeError):
+            self.tag.value = True
+
+    def test_value_write_int_subclass(self):
+        """Verify values of integer subclasses are accepted."""
+        class Subclass(int):
+            pass
+        self.tag.value = Subclass(42)
+        self.assertEqual(self.get_value(), 42)
+        self.assertIs(type(self.tag.value), int)
+
     def test_value_out_of_range(self):
         """Ensure setting out-of-range values raise an exception."""
         try:
@@ -219,6 +322,43 @@ class Integer(Tag):
         """Verify non-integer bit indices raise an exception."""
         with self.assertRaises(TypeError):
             self.tag['foo']
+        with self.assertRaises(TypeError):
+            self.tag[[0]]
+
+    def test_set_bits(self):
+        """Verify setting and clearing several bits with masks."""
+        self.set_value(0x0a)
+        self.tag.set_bits(set_mask=0x05, clear_mask=0x0a)
+        self.assertEqual(self.get_value(), 0x05)
+
+    def test_set_bits_precedence(self):
+        """Verify bits in both masks are set."""
+        self.tag.set_bits(set_mask=0x01, clear_mask=0x01)
+        self.assertEqual(self.get_value(), 1)
+
+    def test_set_bits_sign(self):
+        """Verify setting the sign bit yields a negative value."""
+        self.tag.set_bits(set_mask=1 << (self.bits - 1))
+        self.assertEqual(self.get_value(), self.value_min)
+
+    def test_set_bits_invalid_mask(self):
+        """Verify invalid masks raise exceptions."""
+        with self.assertRaises(TypeError):
+            self.tag.set_bits(set_mask='1')
+        with self.assertRaises(ValueError):
+            self.tag.set_bits(set_mask=1 << self.bits)
+        with self.assertRaises(ValueError):
+            self.tag.set_bits(clear_mask=-1)
+
+    def test_set_bits_raw_data(self):
+        """Ensure setting bits with masks removes undecorated data."""
+        self.tag.set_bits(set_mask=1)
+        self.assert_no_raw_data_element()
+
+    def test_bit_object_reused(self):
+        """Verify repeated access to a bit yields the same object."""
+        self.assertIs(self.tag[1], self.tag[1])
+        self.assertIsNot(self.tag[0], self.tag[1])
 
     def test_bit_value_read(self):
         """Confirm non-sign bits reflect the current integer value."""
@@ -292,6 +432,12 @@ class Integer(Tag):
             self.add_bit_description(bit, comment_text)
             self.assertEqual(self.tag[bit].description, comment_text)
 
+    def test_bit_desc_read_empty(self):
+        """Confirm reading an empty bit description."""
+        for bit in range(self.bits):
+            self.add_bit_description(bit, None)
+            self.assertEqual(self.tag[bit].description, '')
+
     def test_bit_desc_read_none(self):
         """Confirm reading a nonexistent bit description."""
         for bit in range(self.bits):
@@ -454,6 +600,11 @@ class TestBOOL(Tag, unittest.TestCase):
             with self.assertRaises(ValueError):
                 self.tag.value = x
 
+    def test_set_bits(self):
+        """Confirm bit masks cannot be applied to BOOL tags."""
+        with self.assertRaises(TypeError):
+            self.tag.set_bits(set_mask=1)
+
 
 class TestREAL(Tag, unittest.TestCase):
     """REAL type tests."""
@@ -489,6 +640,16 @@ class TestREAL(Tag, unittest.TestCase):
             with self.assertRaises(ValueError):
                 self.tag.value = float(value)
 
+    def test_set_bits(self):
+        """Confirm bit masks cannot be applied to REAL tags."""
+        with self.assertRaises(TypeError):
+            self.tag.set_bits(set_mask=1)
+
+    def test_as_array(self):
+        """Confirm scalar REAL tags cannot be converted to typed arrays."""
+        with self.assertRaises(TypeError):
+            self.tag.as_array()
+
 
 class TestSingleDimensionalArray(Tag, unittest.TestCase):
     """Single-dimensional array tests."""
@@ -570,6 +731,56 @@ class TestSingleDimensionalArray(Tag, unittest.TestCase):
             element = self.get_value_element(i)
             self.assertEqual(new_value, int(element.attrib['Value']))
 
+    def test_value_write_invalid_element(self):
+        """Confirm an invalid element value leaves all elements unmodified."""
+        new = [100 + i for i in range(self.tag.shape[0])]
+        new[-1] = 'not an int'
+        with self.assertRaises(TypeError):
+            self.tag.value = new
+        for i in range(self.tag.shape[0]):
+            element = self.get_value_element(i)
+            self.assertEqual(int(element.attrib['Value']), 0)
+
+    def test_as_array(self):
+        """Confirm values are returned as a typed array."""
+        new = [100 + i for i in range(self.tag.shape[0])]
+        self.tag.value = new
+        values = self.tag.as_array()
+        self.assertIsInstance(values, array.array)
+        self.assertEqual(values.typecode, 'i')
+        self.assertEqual(values.itemsize, 4)
+        self.assertEqual(values.tolist(), new)
+
+    def test_value_write_typed_array(self):
+        """Confirm setting a new value with a typed array."""
+        new = [100 + i for i in range(self.tag.shape[0])]
+        self.tag.value = array.array('i', new)
+        for i in range(len(new)):
+            element = self.get_value_element(i)
+            self.assertEqual(int(element.attrib['Value']), new[i])
+
+    def test_value_write_typed_array_out_of_range(self):
+        """Confirm typed array values are range checked."""
+        with self.assertRaises(ValueError):
+            self.tag.value = array.array('q', [2**31])
+
+    def test_value_write_out_of_range(self):
+        """Confirm an out-of-range value leaves all elements unmodified."""
+        new = [100 + i for i in range(self.tag.shape[0])]
+        new[-1] = 2**31
+        with self.assertRaises(ValueError):
+            self.tag.value = new
+        for i in range(self.tag.shape[0]):
+            element = self.get_value_element(i)
+            self.assertEqual(int(element.attrib['Value']), 0)
+
+    def test_value_write_bool(self):
+        """Confirm a boolean element value is rejected."""
+        new = [100 + i for i in range(self.tag.shape[0])]
+        new[0] = True
+        with self.assertRaises(TypeError):
+            self.tag.value = new
+
     def test_invalid_value_type(self):
         """Test setting value to a non-list raises an exception."""
         with self.assertRaises(TypeError):
@@ -610,6 +821,14 @@ class TestSingleDimensionalArray(Tag, unittest.TestCase):
         self.tag[0].description = None
         desc = self.get_comment(0)
         self.assertIsNone(desc)
+        self.assertIsNone(self.tag.element.find('Comments'))
+
+    def test_element_description_overwrite_single_element(self):
+        """Test overwriting a description does not add Comment elements."""
+        self.set_comment(0, 'old')
+        self.tag[0].description = 'new'
+        comments = self.tag.element.find('Comments')
+        self.assertEqual(len(comments.findall('Comment')), 1)
 
     def test_element_value_raw_data(self):
         """Ensure setting a single element clears undecorated data."""
@@ -641,6 +860,54 @@ class TestSingleDimensionalArray(Tag, unittest.TestCase):
             return None
 
 
+class TestREALArray(Tag, unittest.TestCase):
+    """REAL array tests."""
+    src_xml = """<Tag Name="array" TagType="Base" DataType="REAL" Dimensions="2" Radix="Float" Constant="false" ExternalAccess="Read/Write">
+<Data>00 00 00 00 00 00 00 00</Data>
+<Data Format="Decorated">
+<Array DataType="REAL" Dimensions="2" Radix="Float">
+<Element Index="[0]" Value="0.0"/>
+<Element Index="[1]" Value="1.5"/>
+</Array>
+</Data>
+</Tag>"""
+
+    xml_value = [0.0, 1.5]
+
+    def test_value_read(self):
+        """Confirm reading the top-level value returns a list of floats."""
+        self.assertEqual(self.tag.value, self.src_value)
+
+    def test_value_write(self):
+        """Confirm writing a list of floats."""
+        self.tag.value = [math.pi, math.e]
+        array = self.tag.element.find('Data/Array')
+        values = [float(e.attrib['Value']) for e in array]
+        self.assertEqual(values, [math.pi, math.e])
+
+    def test_value_write_type(self):
+        """Confirm an exception is raised when writing non-float values."""
+        with self.assertRaises(TypeError):
+            self.tag.value = [1, 2]
+
+    def test_value_write_nan(self):
+        """Confirm an exception is raised when writing NaN values."""
+        with self.assertRaises(ValueError):
+            self.tag.value = [float('NaN')]
+
+    def test_as_array(self):
+        """Confirm values are returned as a double precision typed array."""
+        self.tag.value = [math.pi, math.e]
+        values = self.tag.as_array()
+        self.assertEqual(values.typecode, 'd')
+        self.assertEqual(values.tolist(), [math.pi, math.e])
+
+    def test_value_write_inf(self):
+        """Confirm an exception is raised when writing infinite values."""
+        with self.assertRaises(ValueError):
+            self.tag.value = [1.0, float('inf')]
+
+
 class TestMultiDimensionalArray(Tag, unittest.TestCase):
     """Multi-dimensional array tests"""
     src_xml = """<Tag Name="array" TagType="Base" DataType="DINT" Dimensions="2 3 4" Radix="Decimal" Constant="false" ExternalAccess="Read/Write">
@@ -699,6 +966,71 @@ class TestMultiDimensionalArray(Tag, unittest.TestCase):
         self.assertEqual(self.tag.shape[1], len(self.src_value[0]))
         self.assertEqual(self.tag.shape[2], len(self.src_value))
 
+    def test_shape_reread(self):
+        """Confirm the shape reflects a Dimensions attribute altered directly."""
+        self.assertEqual(self.tag.shape, (4, 3, 2))
+        array = self.tag.element.find('Data/Array')
+        array.attrib['Dimensions'] = '1,3,4'
+        self.assertEqual(self.tag.shape, (4, 3, 1))
+
+    def test_subarray_shape(self):
+        """Confirm subarrays report the shape of the entire array."""
+        self.assertEqual(self.tag[1].shape, (4, 3, 2))
+        self.assertEqual(self.tag[1][2].shape, (4, 3, 2))
+
+    def test_as_array_last_dimension(self):
+        """Confirm the last dimension is converted to a typed array."""
+        self.assertEqual(self.tag[1][2].as_array().tolist(),
+                         self.src_value[1][2])
+
+    def test_as_array_invalid_dimension(self):
+        """Confirm other dimensions cannot be converted to typed arrays."""
+        with self.assertRaises(TypeError):
+            self.tag.as_array()
+        with self.assertRaises(TypeError):
+            self.tag[1].as_array()
+
+    def test_subarray_reused(self):
+        """Confirm repeated access to a subarray yields the same object."""
+        self.assertIs(self.tag[1], self.tag[1])
+        self.assertIs(self.tag[1][2], self.tag[1][2])
+        self.assertIsNot(self.tag[0], self.tag[1])
+
+    def test_tuple_index(self):
+        """Confirm a tuple of indices addresses a single member."""
+        self.assertIs(self.tag[1, 2, 3], self.tag[1][2][3])
+        self.assertEqual(self.tag[0, 1, 2].value, self.src_value[0][1][2])
+
+    def test_tuple_index_subarray(self):
+        """Confirm a partial tuple of indices yields a subarray."""
+        self.assertIs(self.tag[1, 2], self.tag[1][2])
+        self.assertIs(self.tag[1][2, 3], self.tag[1][2][3])
+
+    def test_tuple_index_out_of_range(self):
+        """Confirm each index of a tuple is range checked."""
+        for index in [(2, 0, 0), (0, 3, 0), (0, 0, 4), (0, -1, 0)]:
+            with self.assertRaises(IndexError):
+                self.tag[index]
+
+    def test_tuple_index_count(self):
+        """Confirm tuples with too few or too many indices are rejected."""
+        with self.assertRaises(IndexError):
+            self.tag[()]
+        with self.assertRaises(IndexError):
+            self.tag[0, 0, 0, 0]
+        with self.assertRaises(IndexError):
+            self.tag[1][0, 0, 0]
+
+    def test_tuple_index_type(self):
+        """Confirm tuples with non-integer indices are rejected."""
+        with self.assertRaises(TypeError):
+            self.tag[0, 'x', 0]
+
+    def test_subarray_members_shared(self):
+        """Confirm subarrays use the member container of the entire array."""
+        self.assertIs(self.tag[1].members, self.tag.data.members)
+        self.assertIs(self.tag[1][2].members, self.tag.data.members)
+
     def test_value_read(self):
         """Verify reading values for each dimension."""
         self.assertEqual(self.tag.value, self.src_value)
@@ -827,6 +1159,26 @@ class ArrayResize(Tag):
 
         self.assertEqual(xml_idx, new_idx)
 
+    def test_elements_independent(self):
+        """Confirm each new element is a separate copy of the template."""
+        self.resize()
+        elements = list(self.tag.element.find('Data/Array'))
+        elements[0].attrib['Value'] = '42'
+        for e in elements[1:]:
+            self.assertNotEqual(e.attrib['Value'], '42')
+
+    def test_element_access(self):
+        """Confirm elements of the resized array are accessible."""
+        self.tag.value
+        self.resize()
+        array = self.tag.element.find('Data/Array')
+        ranges = [range(d) for d in self.dim]
+        for idx in itertools.product(*ranges):
+            data = self.tag
+            for i in reversed(idx):
+                data = data[i]
+            self.assertIn(data.element, list(array))
+
 
 class ArrayResizeAddDimension(ArrayResize, unittest.TestCase):
     """Tests for resizing an array by adding a dimension."""
@@ -877,6 +1229,35 @@ class ArrayResizeRemoveDimension(ArrayResize, unittest.TestCase):
         self.tag.shape = self.dim
 
 
+class ArrayResizeTranspose(ArrayResize, unittest.TestCase):
+    """Tests for resizing an array without changing the number of elements."""
+    src_xml = """<Tag Name="array" TagType="Base" DataType="DINT" Dimensions="3 2" Radix="Decimal" Constant="false" ExternalAccess="Read/Write">
+<Data>00 00 00 00 01 00 00 00 02 00 00 00 03 00 00 00 
+04 00 00 00 05 00 00 00</Data>
+<Data Format="Decorated">
+<Array DataType="DINT" Dimensions="3,2" Radix="Decimal">
+<Element Index="[0,0]" Value="0"/>
+<Element Index="[0,1]" Value="1"/>
+<Element Index="[1,0]" Value="2"/>
+<Element Index="[1,1]" Value="3"/>
+<Element Index="[2,0]" Value="4"/>
+<Element Index="[2,1]" Value="5"/>
+</Array>
+</Data>
+</Tag>"""
+
+    xml_value = [
+        [0, 1],
+        [2, 3],
+        [4, 5]
+    ]
+
+    def resize(self):
+        """Swaps the dimensions."""
+        self.dim = (3, 2)
+        self.tag.shape = self.dim
+
+
 class ArrayResizeEnlarge(ArrayResize, unittest.TestCase):
     """Tests for resizing an array by enlarging a dimension."""
     src_xml = """<Tag Name="array" TagType="Base" DataType="DINT" Dimensions="3 2" Radix="Decimal" Constant="false" ExternalAccess="Read/Write">
@@ -1039,6 +1420,17 @@ class Structure(Tag, unittest.TestCase):
         with self.assertRaises(KeyError):
             self.tag['foo'].value
 
+    def test_set_bits(self):
+        """Confirm bit masks cannot be applied to structure tags."""
+        with self.assertRaises(TypeError):
+            self.tag.set_bits(set_mask=1)
+
+    def test_member_keys_interned(self):
+        """Confirm member names are interned when indexed."""
+        self.tag['PRE']
+        for name in self.tag.data.members.elements:
+            self.assertIs(name, intern(name))
+
     def test_member_value_read(self):
         """Test reading individual member values."""
         for name in self.src_value:
@@ -1132,6 +1524,96 @@ class Compound(Tag, unittest.TestCase):
             self.tag['dint_array'].shape = (1,)
 
 
+class NestedStructure(Tag, unittest.TestCase):
+    """Tests for structures containing members of varying types."""
+    src_xml = """<Tag Name="udt" TagType="Base" DataType="outer" Constant="false" ExternalAccess="Read/Write">
+<Data>00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00</Data>
+<Data Format="Decorated">
+<Structure DataType="outer">
+<DataValueMember Name="dint" DataType="DINT" Radix="Decimal" Value="-5"/>
+<DataValueMember Name="real" DataType="REAL" Radix="Float" Value="1.5"/>
+<ArrayMember Name="array" DataType="INT" Dimensions="2" Radix="Decimal">
+<Element Index="[0]" Value="1"/>
+<Element Index="[1]" Value="2"/>
+</ArrayMember>
+<StructureMember Name="inner" DataType="inner">
+<DataValueMember Name="bool" DataType="BOOL" Value="1"/>
+</StructureMember>
+</Structure>
+</Data>
+</Tag>"""
+
+    xml_value = {
+        'dint':-5,
+        'real':1.5,
+        'array':[1, 2],
+        'inner':{'bool':1}
+    }
+
+    def test_value_read(self):
+        """Confirm reading the value converts every member type."""
+        self.assertEqual(self.tag.value, self.src_value)
+
+    def test_value_reread(self):
+        """Confirm the value reflects members written individually."""
+        self.tag['dint'].value = 7
+        self.tag['inner']['bool'].value = 0
+        self.src_value['dint'] = 7
+        self.src_value['inner']['bool'] = 0
+        self.assertEqual(self.tag.value, self.src_value)
+
+
+class StructureArray(Tag, unittest.TestCase):
+    """Tests for arrays of structured data types."""
+    src_xml = """<Tag Name="udt_array" TagType="Base" DataType="udt" Dimensions="2" Constant="false" ExternalAccess="Read/Write">
+<Data>00 00 00 00 00 00 00 00</Data>
+<Data Format="Decorated">
+<Array DataType="udt" Dimensions="2">
+<Element Index="[0]">
+<Structure DataType="udt">
+<DataValueMember Name="a" DataType="DINT" Radix="Decimal" Value="1"/>
+<DataValueMember Name="b" DataType="DINT" Radix="Decimal" Value="2"/>
+</Structure>
+</Element>
+<Element Index="[1]">
+<Structure DataType="udt">
+<DataValueMember Name="a" DataType="DINT" Radix="Decimal" Value="3"/>
+<DataValueMember Name="b" DataType="DINT" Radix="Decimal" Value="4"/>
+</Structure>
+</Element>
+</Array>
+</Data>
+</Tag>"""
+
+    xml_value = [{'a':1, 'b':2}, {'a':3, 'b':4}]
+
+    def test_value_read(self):
+        """Confirm reading the top-level value returns a list of dicts."""
+        self.assertEqual(self.tag.value, self.src_value)
+
+    def test_value_write(self):
+        """Confirm writing a list of dicts updates each structure."""
+        new = [{'a':10, 'b':20}, {'a':30, 'b':40}]
+        self.tag.value = new
+        self.assertEqual(self.tag.value, new)
+        self.assertEqual(self.tag[1]['b'].value, 40)
+
+    def test_as_array(self):
+        """Confirm structure arrays cannot be converted to typed arrays."""
+        with self.assertRaises(TypeError):
+            self.tag.as_array()
+
+    def test_set_bits(self):
+        """Confirm bit masks cannot be applied to array tags."""
+        with self.assertRaises(TypeError):
+            self.tag.set_bits(set_mask=1)
+
+    def test_value_write_short(self):
+        """Confirm writing a shorter list leaves remaining members unchanged."""
+        self.tag.value = [{'a':10}]
+        self.assertEqual(self.tag.value, [{'a':10, 'b':2}, {'a':3, 'b':4}])
+
+
 class Base(unittest.TestCase):
     """Tests for base, i.e. not produced or consumed, tags."""
     def setUp(self):